@@ -0,0 +1,258 @@
+"""
+This module contains an array based representation of a solution of the savings algorithm. The routes are
+stored as integer arrays indexed by node identifier instead of a graph of Route and Edge objects, so merging
+two routes is a splice of their endpoints.
+"""
+
+import numpy as np
+from _graph import Solution
+
+
+class ArraySolution:
+    """
+    A class to represent a solution as a set of routes stored in arrays
+
+    Every node is identified by its identifier, the depot being the node 0, and every route by the identifier
+    of one of its nodes. The nodes of a route are linked by the prev and next arrays, the depot being
+    represented by 0. When two routes are merged the smaller one is reversed if needed and its nodes are
+    relabeled, so a full construction relabels every node O(log n) times at most.
+
+    Attributes
+    ----------
+    veh_capacity : int
+        max amount of goods a vehicle can carry
+    route_id : list
+        route that each node belongs to
+    prev : list
+        node visited before each node, 0 for the first node of a route
+    next : list
+        node visited after each node, 0 for the last node of a route
+    head : list
+        first node of each route
+    tail : list
+        last node of each route
+    load : list
+        total demand covered by each route
+    route_cost : list
+        cost in distance of each route
+    members : list
+        nodes of each route, in no particular order
+    cost : float
+        sum of the costs of the routes
+
+    Methods
+    -------
+    __repr__()
+        establishes how the class is printed
+    __len__()
+        returns the number of routes
+    is_interior(node)
+        tells if the node is not connected to the depot
+    is_joinable(i, j)
+        checks if the routes of two nodes can be merged by them
+    merge(i, j, saving)
+        merges the routes of two nodes by them
+    node_routes()
+        returns the routes as lists of node identifiers
+    to_solution(nodes, distances)
+        exports the solution to the graph representation
+    """
+    def __init__(self, depot_distances: list, demands: list, veh_capacity: int):
+        """
+        Creates the dummy solution where every node has its own route depot-node-depot
+
+        Parameters
+        ----------
+        depot_distances : list
+            distance from the depot to each node, indexed by node identifier
+        demands : list
+            demand of each node, indexed by node identifier
+        veh_capacity : int
+            max amount of goods a vehicle can carry
+        """
+        n = len(demands)
+        self.veh_capacity = veh_capacity
+        self.route_id = list(range(n))
+        self.prev = [0] * n
+        self.next = [0] * n
+        self.head = list(range(n))
+        self.tail = list(range(n))
+        self.load = list(demands)
+        self.route_cost = [2 * distance for distance in depot_distances]
+        self.members = [[node] for node in range(n)]
+        self.members[0] = []
+        self.cost = sum(self.route_cost[1:])
+        self._n_routes = n - 1
+
+    @classmethod
+    def from_nodes(cls, depot, nodes: list, veh_capacity: int, distances: np.ndarray = None):
+        """
+        Creates the dummy solution of a set of nodes
+
+        Parameters
+        ----------
+        depot : Node
+            the node from where the routes start
+        nodes : list
+            the nodes to be supplied
+        veh_capacity : int
+            max amount of goods a vehicle can carry
+        distances : np.ndarray
+            distance matrix of the instance indexed by node identifier, if None the distances are computed
+
+        Returns
+        -------
+        solution : ArraySolution
+            the dummy solution
+        """
+        if distances is not None:
+            depot_distances = distances[0].tolist()
+        else:
+            x = np.array([depot.x] + [node.x for node in nodes], dtype=float)
+            y = np.array([depot.y] + [node.y for node in nodes], dtype=float)
+            dx, dy = x - depot.x, y - depot.y
+            depot_distances = np.sqrt(dx * dx + dy * dy).tolist()
+        demands = [0.0] + [node.demand for node in nodes]
+        return cls(depot_distances, demands, veh_capacity)
+
+    def __repr__(self):
+        return 'ArraySolution ({} routes, cost = {})'.format(self._n_routes, self.cost)
+
+    def __len__(self):
+        return self._n_routes
+
+    def is_interior(self, node: int) -> bool:
+        """
+        Tells if the node is not connected to the depot
+
+        Parameters
+        ----------
+        node : int
+            identifier of the node
+
+        Returns
+        -------
+        bool
+            True if the node is neither the first nor the last of its route
+        """
+        route = self.route_id[node]
+        return node != self.head[route] and node != self.tail[route]
+
+    def is_joinable(self, i: int, j: int) -> bool:
+        """
+        Checks if two routes can be merged by a specific pair of nodes
+        Two routes can be merged by two nodes if:
+            - Both nodes are not interior
+            - AND the nodes do not belong to the same route
+            - AND the sum of the demand of both routes is not greater than the vehicle capacity
+
+        Parameters
+        ----------
+        i : int
+            identifier of a node to merge
+        j : int
+            identifier of a node to merge
+
+        Returns
+        -------
+        bool
+            specifies if it is possible to join both routes
+        """
+        i_route, j_route = self.route_id[i], self.route_id[j]
+        if i_route == j_route:
+            return False
+        if i != self.head[i_route] and i != self.tail[i_route]:
+            return False
+        if j != self.head[j_route] and j != self.tail[j_route]:
+            return False
+        return self.load[i_route] + self.load[j_route] <= self.veh_capacity
+
+    def _reverse(self, route: int) -> None:
+        """
+        Reverses the order of the nodes of a route
+        """
+        prev, next_ = self.prev, self.next
+        for node in self.members[route]:
+            prev[node], next_[node] = next_[node], prev[node]
+        self.head[route], self.tail[route] = self.tail[route], self.head[route]
+
+    def merge(self, i: int, j: int, saving: float) -> None:
+        """
+        Merges the routes of two nodes by linking them, the pair must be joinable
+
+        Parameters
+        ----------
+        i : int
+            identifier of a node to merge
+        j : int
+            identifier of a node to merge
+        saving : float
+            distance saved when merging the routes by this pair
+        """
+        i_route, j_route = self.route_id[i], self.route_id[j]
+        small = i_route if len(self.members[i_route]) <= len(self.members[j_route]) else j_route
+
+        # orients the routes so that the first ends in i and the second starts in j, or the other way round
+        if self.tail[i_route] == i and self.head[j_route] == j:
+            first, second = i_route, j_route
+        elif self.head[i_route] == i and self.tail[j_route] == j:
+            first, second = j_route, i_route
+        else:
+            self._reverse(small)
+            if self.tail[i_route] == i:
+                first, second = i_route, j_route
+            else:
+                first, second = j_route, i_route
+
+        # splices the endpoints
+        first_tail, second_head = self.tail[first], self.head[second]
+        self.next[first_tail] = second_head
+        self.prev[second_head] = first_tail
+
+        # the nodes of the smaller route are relabeled
+        large = j_route if small == i_route else i_route
+        for node in self.members[small]:
+            self.route_id[node] = large
+        self.members[large].extend(self.members[small])
+        self.members[small] = []
+        self.head[large], self.tail[large] = self.head[first], self.tail[second]
+        self.load[large] += self.load[small]
+        self.route_cost[large] += self.route_cost[small] - saving
+        self.cost -= saving
+        self._n_routes -= 1
+
+    def node_routes(self) -> list:
+        """
+        Returns a compact representation of the solution, the routes are sorted by identifier
+
+        Returns
+        -------
+        routes : list
+            for every route, the list of the identifiers of the visited nodes in order, depot excluded
+        """
+        routes = list()
+        for route, members in enumerate(self.members):
+            if members:
+                node_ids = [self.head[route]]
+                while self.next[node_ids[-1]] != 0:
+                    node_ids.append(self.next[node_ids[-1]])
+                routes.append(node_ids)
+        return routes
+
+    def to_solution(self, nodes: list, distances: np.ndarray = None) -> Solution:
+        """
+        Exports the solution to the graph representation, for plotting or compatibility
+
+        Parameters
+        ----------
+        nodes : list
+            the nodes to be supplied, with their edges to the depot already built
+        distances : np.ndarray
+            distance matrix of the instance indexed by node identifier, if None the costs are computed
+
+        Returns
+        -------
+        solution : Solution
+            the solution as a set of Route objects
+        """
+        return Solution.from_routes(nodes, self.node_routes(), distances)
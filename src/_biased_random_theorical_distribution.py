@@ -1,12 +1,55 @@
 """
 This module contains the function to generate positions in an array/list with biased random functions.
+The built-in distributions are also available as samplers that map a uniform random number to a position
+in constant time, one at a time or vectorized.
 """
 
+from __future__ import annotations
+
+import inspect
+import math
 import numpy as np
+from abc import ABC, abstractmethod
+from bisect import bisect_right
 from types import FunctionType
 
 
-def get_random_position(n: int, rand_function: FunctionType) -> int:
+class UniformStream:
+    """
+    A class to represent a stream of uniform random numbers in [0, 1)
+
+    The numbers are drawn from a numpy Generator in blocks, so obtaining a number is an index
+    in a list instead of a call to numpy. The sequence only depends on the generator, not on the size of the blocks.
+
+    Methods
+    -------
+    __call__()
+        returns the next uniform random number of the stream
+    """
+    def __init__(self, rng: np.random.Generator | int | np.random.SeedSequence = None, block_size: int = 4096):
+        """
+        Parameters
+        ----------
+        rng : Generator, int or SeedSequence
+            generator of the random numbers or seed to create it, if None fresh entropy is used
+        block_size : int
+            amount of numbers drawn from the generator at once
+        """
+        self.rng = np.random.default_rng(rng)
+        self.block_size = block_size
+        self._block = []
+        self._next = 0
+
+    def __call__(self) -> float:
+        if self._next == len(self._block):
+            self._block = self.rng.random(self.block_size).tolist()
+            self._next = 0
+        u = self._block[self._next]
+        self._next += 1
+        return u
+
+
+def get_random_position(n: int, rand_function: FunctionType, uniform: UniformStream = None) -> int:
     """
     Returns a random position in a range given a distribution probability function
 
@@ -15,7 +58,10 @@ def get_random_position(n: int, rand_function: FunctionType) -> int:
     n : int
         length of the array
     rand_function : function
-        the function that models how the distribution probability is constructed
+        the function that models how the distribution probability is constructed, it receives the length
+        of the array and a uniform random number, or only the length when no stream is given
+    uniform : UniformStream
+        the stream of uniform random numbers, if None the function draws its own random numbers
 
     Returns
     -------
@@ -23,6 +69,450 @@ def get_random_position(n: int, rand_function: FunctionType) -> int:
         position selected in the array
     """
     position = 0
-    while position < 0.5:
-        position = int(np.round(rand_function(n)))
+    if uniform is None:
+        while position < 0.5:
+            position = int(round(rand_function(n)))
+    else:
+        while position < 0.5:
+            position = int(round(rand_function(n, uniform())))
     return position - 1
+
+
+class Sampler(ABC):
+    """
+    A base class to represent a biased selection of positions in a list
+
+    Methods
+    -------
+    sample(length, uniform)
+        returns a random position in a list of the given length
+    """
+    @abstractmethod
+    def sample(self, length: int, uniform: UniformStream) -> int:
+        """
+        Returns a random position in a list
+
+        Parameters
+        ----------
+        length : int
+            length of the list
+        uniform : UniformStream
+            the stream of uniform random numbers
+
+        Returns
+        -------
+        position : int
+            position selected in the list
+        """
+
+
+class PositionSampler(Sampler):
+    """
+    A base class to represent a biased selection of positions in a list that maps a uniform random number
+    directly to a position, without rejection
+
+    Methods
+    -------
+    position(length, u)
+        returns the position in a list of the given length that corresponds to a uniform random number
+    positions(length, u)
+        vectorized version of position for an array of uniform random numbers
+    sample(length, uniform)
+        returns a random position in a list of the given length
+    """
+    @abstractmethod
+    def position(self, length: int, u: float) -> int:
+        """
+        Returns the position in a list that corresponds to a uniform random number
+
+        Parameters
+        ----------
+        length : int
+            length of the list
+        u : float
+            uniform random number in [0, 1)
+
+        Returns
+        -------
+        position : int
+            position selected in the list
+        """
+
+    @abstractmethod
+    def positions(self, length: int, u: np.ndarray) -> np.ndarray:
+        """
+        Returns the positions in a list that correspond to an array of uniform random numbers
+
+        Parameters
+        ----------
+        length : int
+            length of the list
+        u : np.ndarray
+            uniform random numbers in [0, 1)
+
+        Returns
+        -------
+        positions : np.ndarray
+            positions selected in the list
+        """
+
+    def sample(self, length: int, uniform: UniformStream) -> int:
+        """
+        Returns a random position in a list
+
+        Parameters
+        ----------
+        length : int
+            length of the list
+        uniform : UniformStream
+            the stream of uniform random numbers
+
+        Returns
+        -------
+        position : int
+            position selected in the list
+        """
+        return self.position(length, uniform())
+
+
+class TriangularSampler(PositionSampler):
+    """
+    A class to represent a selection with the decreasing triangular distribution of the original algorithm,
+    which rounds n * (1 - sqrt(u)) for a list of length n and rejects the zeros. Without the rejection the
+    position is the floor of (n - 0.5) * (1 - sqrt(u)), so the probability of the position k is proportional
+    to n - 1 - k, except for the last position whose weight is 1 / 8.
+    """
+    def __repr__(self):
+        return 'TriangularSampler'
+
+    def position(self, length, u):
+        return min(int((length - 0.5) * (1 - math.sqrt(u))), length - 1)
+
+    def positions(self, length, u):
+        return np.minimum(((length - 0.5) * (1 - np.sqrt(u))).astype(int), length - 1)
+
+
+class GeometricSampler(PositionSampler):
+    """
+    A class to represent a selection with a geometric distribution of parameter beta, the positions beyond
+    the end of the list wrap around to its beginning
+
+    Attributes
+    ----------
+    beta : float
+        parameter that models the uniformity of the distribution
+    """
+    def __init__(self, beta: float):
+        """
+        Parameters
+        ----------
+        beta : float
+            parameter that models the uniformity of the distribution
+        """
+        self.beta = beta
+        self._log_q = math.log(1 - beta)
+
+    def __repr__(self):
+        return 'GeometricSampler (beta={})'.format(self.beta)
+
+    def position(self, length, u):
+        return int(math.log(1 - u) / self._log_q) % length
+
+    def positions(self, length, u):
+        return (np.log1p(-u) / self._log_q).astype(int) % length
+
+
+class TruncatedGeometricSampler(PositionSampler):
+    """
+    A class to represent a selection with a geometric distribution of parameter beta truncated
+    to the length of the list, the probability of the positions beyond the end is redistributed proportionally
+
+    Attributes
+    ----------
+    beta : float
+        parameter that models the uniformity of the distribution
+    """
+    def __init__(self, beta: float):
+        """
+        Parameters
+        ----------
+        beta : float
+            parameter that models the uniformity of the distribution
+        """
+        self.beta = beta
+        self._log_q = math.log(1 - beta)
+
+    def __repr__(self):
+        return 'TruncatedGeometricSampler (beta={})'.format(self.beta)
+
+    def position(self, length, u):
+        # inverse of the cumulative distribution function restricted to the first positions
+        mass = -math.expm1(length * self._log_q)
+        return min(int(math.log1p(-u * mass) / self._log_q), length - 1)
+
+    def positions(self, length, u):
+        mass = -math.expm1(length * self._log_q)
+        return np.minimum((np.log1p(-u * mass) / self._log_q).astype(int), length - 1)
+
+
+class FunctionSampler(Sampler):
+    """
+    A class to represent a selection given by a distribution probability function, the positions are obtained
+    with get_random_position so the function is evaluated until a valid position is found. As a single uniform
+    random number may not lead to a valid position, the selection can not be expressed as a PositionSampler.
+
+    Attributes
+    ----------
+    rand_function : function
+        the function that models how the distribution probability is constructed
+    uniform_argument : bool
+        True if the function receives a uniform random number of the stream, False if it draws its own
+    """
+    def __init__(self, rand_function: FunctionType):
+        """
+        Parameters
+        ----------
+        rand_function : function
+            the function that models how the distribution probability is constructed, it receives the length
+            of the list minus one and, optionally, a uniform random number. A function of the length only
+            draws its own random numbers, so its replicas do not depend on the seed
+        """
+        self.rand_function = rand_function
+        self.uniform_argument = _positional_arity(rand_function) >= 2
+
+    def __repr__(self):
+        return 'FunctionSampler ({})'.format(self.rand_function)
+
+    def sample(self, length, uniform):
+        return get_random_position(length - 1, self.rand_function, uniform if self.uniform_argument else None)
+
+
+def _positional_arity(function: FunctionType) -> int:
+    """
+    Returns the number of positional arguments without default a function requires, two if it accepts any
+    number of them and one if its signature can not be inspected
+    """
+    try:
+        parameters = inspect.signature(function).parameters.values()
+    except (TypeError, ValueError):
+        return 1
+    arity = 0
+    for parameter in parameters:
+        if parameter.kind == parameter.VAR_POSITIONAL:
+            return 2
+        if parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD) \
+                and parameter.default is parameter.empty:
+            arity += 1
+    return arity
+
+
+class AliasTable:
+    """
+    A class to represent the alias table (Walker, Vose) of a discrete distribution, which allows to draw
+    a position in constant time with a single uniform random number
+
+    Attributes
+    ----------
+    probability : list
+        probability of keeping the column drawn
+    alias : list
+        position drawn when the column is not kept
+    cumulative : list
+        cumulative sum of the normalized weights, the mass of the first k positions is cumulative[k - 1]
+    """
+    def __init__(self, weights: np.ndarray):
+        """
+        Parameters
+        ----------
+        weights : np.ndarray
+            non negative weights of the positions, at least one of them must be positive
+        """
+        weights = np.asarray(weights, dtype=float)
+        if weights.ndim != 1 or len(weights) == 0:
+            raise ValueError('the weights must be a non empty vector')
+        if np.any(weights < 0) or not np.all(np.isfinite(weights)):
+            raise ValueError('the weights must be finite and non negative')
+        total = weights.sum()
+        if total <= 0:
+            raise ValueError('at least one weight must be positive')
+
+        size = len(weights)
+        scaled = (weights * size / total).tolist()
+        probability = [1.0] * size
+        alias = list(range(size))
+        small = [k for k, weight in enumerate(scaled) if weight < 1.0]
+        large = [k for k, weight in enumerate(scaled) if weight >= 1.0]
+        while small and large:
+            k, m = small.pop(), large.pop()
+            probability[k] = scaled[k]
+            alias[k] = m
+            scaled[m] -= 1.0 - scaled[k]
+            if scaled[m] < 1.0:
+                small.append(m)
+            else:
+                large.append(m)
+
+        self.size = size
+        self.probability = probability
+        self.alias = alias
+        self._cumulative = np.cumsum(weights / total)
+        self.cumulative = self._cumulative.tolist()
+        self._probability = np.array(probability)
+        self._alias = np.array(alias)
+
+    def __repr__(self):
+        return 'AliasTable ({} positions)'.format(self.size)
+
+    def draw(self, u: float) -> int:
+        """
+        Returns the position that corresponds to a uniform random number
+
+        Parameters
+        ----------
+        u : float
+            uniform random number in [0, 1), its integer part once scaled selects the column
+            and its fractional part decides between the column and its alias
+
+        Returns
+        -------
+        position : int
+            position drawn
+        """
+        x = u * self.size
+        column = int(x)
+        if x - column < self.probability[column]:
+            return column
+        return self.alias[column]
+
+    def draws(self, u: np.ndarray) -> np.ndarray:
+        """
+        Vectorized version of draw
+
+        Parameters
+        ----------
+        u : np.ndarray
+            uniform random numbers in [0, 1)
+
+        Returns
+        -------
+        positions : np.ndarray
+            positions drawn
+        """
+        x = np.asarray(u) * self.size
+        columns = x.astype(int)
+        return np.where(x - columns < self._probability[columns], columns, self._alias[columns])
+
+
+class AliasSampler(PositionSampler):
+    """
+    A class to represent a selection with any discrete distribution over the positions of the list,
+    given by a vector of weights by rank or by a function that returns the weights of an array of ranks.
+
+    The alias tables are built once per bucket of lengths (the powers of two), with the weights of the ranks
+    of the bucket, so the draws are constant time. A position beyond the end of the list is discarded and
+    drawn again, which keeps the distribution exact. When the positions beyond the end hold half the mass
+    of the bucket or more, the position is found instead by a binary search of the cumulative mass of the
+    table, so at most two draws are expected and no table is built for a single length.
+
+    Attributes
+    ----------
+    weights : np.ndarray or function
+        weights of the positions by rank, or function that receives an array of ranks and returns their weights
+    """
+    def __init__(self, weights: np.ndarray | FunctionType):
+        """
+        Parameters
+        ----------
+        weights : np.ndarray, list or function
+            weights of the positions by rank, or function that receives an array of ranks and returns their
+            weights, for instance lambda k: 0.8 ** k
+        """
+        self.weights = weights if callable(weights) else np.asarray(weights, dtype=float)
+        self._tables = dict()
+
+    def __repr__(self):
+        return 'AliasSampler ({} tables)'.format(len(self._tables))
+
+    def _weights(self, length: int) -> np.ndarray:
+        """
+        Returns the weights of the first positions of a list of the given length
+        """
+        if callable(self.weights):
+            weights = np.asarray(self.weights(np.arange(length)), dtype=float)
+            if weights.shape != (length,):
+                raise ValueError('the weight function returned {} weights for {} ranks'.format(
+                    weights.size, length))
+            return weights
+        return self.weights[:length]
+
+    def table(self, length: int) -> AliasTable:
+        """
+        Returns the alias table of the bucket of the given length, built the first time it is requested
+
+        Parameters
+        ----------
+        length : int
+            length of the list
+
+        Returns
+        -------
+        table : AliasTable
+            the table of the smallest power of two not lower than the length
+        """
+        bucket = 1 << (length - 1).bit_length()
+        table = self._tables.get(bucket)
+        if table is None:
+            table = AliasTable(self._weights(bucket))
+            self._tables[bucket] = table
+        return table
+
+    def _restricted(self, length: int) -> tuple:
+        """
+        Returns the table of the bucket of the given length, the number of its positions inside the list
+        and the mass of those positions
+        """
+        table = self.table(length)
+        size = min(length, table.size)
+        mass = table.cumulative[size - 1]
+        if mass <= 0:
+            raise ValueError('the weights of the first {} positions are all zero'.format(length))
+        return table, size, mass
+
+    def position(self, length, u):
+        table, size, mass = self._restricted(length)
+        return min(bisect_right(table.cumulative, u * mass, 0, size), size - 1)
+
+    def positions(self, length, u):
+        table, size, mass = self._restricted(length)
+        return np.minimum(np.searchsorted(table._cumulative[:size], np.asarray(u) * mass, side='right'), size - 1)
+
+    def sample(self, length, uniform):
+        table, size, mass = self._restricted(length)
+        if mass < 0.5:
+            return min(bisect_right(table.cumulative, uniform() * mass, 0, size), size - 1)
+        position = table.draw(uniform())
+        while position >= length:
+            position = table.draw(uniform())
+        return position
+
+
+def as_sampler(rand_function: Sampler | FunctionType | np.ndarray) -> Sampler:
+    """
+    Returns the sampler that corresponds to a sampler, a distribution probability function or a vector of weights
+
+    Parameters
+    ----------
+    rand_function : Sampler, function, np.ndarray or list
+        the sampler, the function that models how the distribution probability is constructed
+        or the weights of the positions by rank
+
+    Returns
+    -------
+    sampler : Sampler
+        the sampler itself, the function wrapped as a sampler or the alias sampler of the weights
+    """
+    if isinstance(rand_function, Sampler):
+        return rand_function
+    if isinstance(rand_function, (np.ndarray, list, tuple)):
+        return AliasSampler(rand_function)
+    return FunctionSampler(rand_function)
@@ -0,0 +1,347 @@
+"""
+This module contains the container of the live candidates of a savings list. It allows to select the k-th
+remaining candidate and to delete it in logarithmic time by means of a Fenwick tree, and the mapping from nodes to
+the candidates that touch them. A second container only exposes a window with the first live candidates.
+"""
+
+from bisect import bisect_left
+import numpy as np
+
+
+class CandidateList:
+    """
+    A class to represent the candidates of a sorted savings list that are still available
+
+    The candidates are identified by their index in the sorted savings list. A Fenwick (binary indexed) tree
+    counts the live candidates so that positions can be translated into indices without shifting any list.
+
+    Attributes
+    ----------
+    size : int
+        number of candidates the container was created with
+
+    Methods
+    -------
+    __len__()
+        returns the number of live candidates
+    __contains__(index)
+        tells if the candidate with the given index is still alive
+    __iter__()
+        iterates over the indices of the live candidates in order
+    select(position)
+        returns the index of the candidate in the given position among the live ones
+    remove(index)
+        deletes the candidate with the given index
+    remove_many(indices)
+        deletes the candidates with the given indices
+    pop(position)
+        selects and deletes the candidate in the given position among the live ones
+    """
+    def __init__(self, size: int):
+        """
+        Parameters
+        ----------
+        size : int
+            number of candidates of the savings list
+        """
+        self.size = size
+        self._length = size
+        self._alive = bytearray(b'\x01') * size
+        self._step = 1 << (size.bit_length() - 1) if size > 0 else 0
+
+        # linear time construction of a tree where every candidate is counted once
+        tree = [0] + [1] * size
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def __len__(self):
+        return self._length
+
+    def __contains__(self, index):
+        return 0 <= index < self.size and self._alive[index] == 1
+
+    def __iter__(self):
+        alive = self._alive
+        return (index for index in range(self.size) if alive[index])
+
+    def __repr__(self):
+        return 'CandidateList ({} of {} alive)'.format(self._length, self.size)
+
+    def select(self, position: int) -> int:
+        """
+        Returns the index of the candidate in the given position among the live ones
+
+        Parameters
+        ----------
+        position : int
+            position of the candidate counting only the live ones
+
+        Returns
+        -------
+        index : int
+            index of the candidate in the sorted savings list
+        """
+        if not 0 <= position < self._length:
+            raise IndexError('position {} out of range'.format(position))
+        tree = self._tree
+        remaining = position + 1
+        index = 0
+        step = self._step
+        while step:
+            next_index = index + step
+            if next_index <= self.size and tree[next_index] < remaining:
+                index = next_index
+                remaining -= tree[next_index]
+            step >>= 1
+        return index
+
+    def remove(self, index: int) -> None:
+        """
+        Deletes the candidate with the given index, nothing is done if it was already deleted
+
+        Parameters
+        ----------
+        index : int
+            index of the candidate in the sorted savings list
+        """
+        if not self._alive[index]:
+            return
+        self._alive[index] = 0
+        self._length -= 1
+        tree = self._tree
+        i = index + 1
+        while i <= self.size:
+            tree[i] -= 1
+            i += i & -i
+
+    def remove_many(self, indices: list) -> None:
+        """
+        Deletes the candidates with the given indices, the ones already deleted are skipped
+
+        Parameters
+        ----------
+        indices : list
+            indices of the candidates in the sorted savings list
+        """
+        alive, tree, size = self._alive, self._tree, self.size
+        for index in indices:
+            if alive[index]:
+                alive[index] = 0
+                self._length -= 1
+                i = index + 1
+                while i <= size:
+                    tree[i] -= 1
+                    i += i & -i
+
+    def pop(self, position: int) -> int:
+        """
+        Selects and deletes the candidate in the given position among the live ones
+
+        Parameters
+        ----------
+        position : int
+            position of the candidate counting only the live ones
+
+        Returns
+        -------
+        index : int
+            index of the deleted candidate in the sorted savings list
+        """
+        index = self.select(position)
+        self.remove(index)
+        return index
+
+
+class CandidateWindow:
+    """
+    A class to represent the first candidates of a sorted savings list that are still available
+
+    Only the first live candidates, up to the width of the window, can be selected. When a candidate of the
+    window is deleted the window slides to the next live candidate of the list, so the cost of a selection
+    does not depend on the length of the list. As the list runs out the window shrinks to the remaining
+    candidates, and with a width of one the selection follows the deterministic order of the savings.
+
+    Attributes
+    ----------
+    size : int
+        number of candidates the container was created with
+    width : int
+        max number of candidates in the window
+
+    Methods
+    -------
+    __len__()
+        returns the number of live candidates in the window, zero only when no candidate is alive
+    __contains__(index)
+        tells if the candidate with the given index is still alive
+    __iter__()
+        iterates over the indices of the live candidates in order
+    select(position)
+        returns the index of the candidate in the given position of the window
+    remove(index)
+        deletes the candidate with the given index
+    remove_many(indices)
+        deletes the candidates with the given indices
+    pop(position)
+        selects and deletes the candidate in the given position of the window
+    """
+    def __init__(self, size: int, width: int):
+        """
+        Parameters
+        ----------
+        size : int
+            number of candidates of the savings list
+        width : int
+            max number of candidates in the window, at least one
+        """
+        if width < 1:
+            raise ValueError('the width of the window must be at least 1, not {}'.format(width))
+        self.size = size
+        self.width = width
+        self._alive = bytearray(b'\x01') * size
+        self._window = list(range(min(width, size)))
+        self._cursor = len(self._window)  # first candidate of the list not yet visited by the window
+
+    def __len__(self):
+        return len(self._window)
+
+    def __contains__(self, index):
+        return 0 <= index < self.size and self._alive[index] == 1
+
+    def __iter__(self):
+        alive = self._alive
+        return (index for index in range(self.size) if alive[index])
+
+    def __repr__(self):
+        return 'CandidateWindow ({} of {} in the window)'.format(len(self._window), self.width)
+
+    def _refill(self) -> None:
+        """
+        Appends to the window the next live candidates of the list until it is full or the list ends
+        """
+        window, alive, cursor = self._window, self._alive, self._cursor
+        while len(window) < self.width and cursor < self.size:
+            if alive[cursor]:
+                window.append(cursor)
+            cursor += 1
+        self._cursor = cursor
+
+    def select(self, position: int) -> int:
+        """
+        Returns the index of the candidate in the given position of the window
+
+        Parameters
+        ----------
+        position : int
+            position of the candidate in the window
+
+        Returns
+        -------
+        index : int
+            index of the candidate in the sorted savings list
+        """
+        if not 0 <= position < len(self._window):
+            raise IndexError('position {} out of range'.format(position))
+        return self._window[position]
+
+    def remove(self, index: int) -> None:
+        """
+        Deletes the candidate with the given index, nothing is done if it was already deleted
+
+        Parameters
+        ----------
+        index : int
+            index of the candidate in the sorted savings list
+        """
+        if not self._alive[index]:
+            return
+        self._alive[index] = 0
+        if index < self._cursor:
+            del self._window[bisect_left(self._window, index)]
+            self._refill()
+
+    def remove_many(self, indices: list) -> None:
+        """
+        Deletes the candidates with the given indices, the ones already deleted are skipped.
+        The window is refilled once after all the deletions.
+
+        Parameters
+        ----------
+        indices : list
+            indices of the candidates in the sorted savings list
+        """
+        alive = self._alive
+        for index in indices:
+            alive[index] = 0
+        self._window = [index for index in self._window if alive[index]]
+        self._refill()
+
+    def pop(self, position: int) -> int:
+        """
+        Selects and deletes the candidate in the given position of the window
+
+        Parameters
+        ----------
+        position : int
+            position of the candidate in the window
+
+        Returns
+        -------
+        index : int
+            index of the deleted candidate in the sorted savings list
+        """
+        index = self.select(position)
+        self.remove(index)
+        return index
+
+
+def node_candidates(pairs: np.ndarray, n_nodes: int) -> list:
+    """
+    Returns, for every node, the indices of the candidates of the savings list that touch it
+
+    Parameters
+    ----------
+    pairs : np.ndarray
+        (m, 2) array with the identifiers of the nodes of each candidate
+    n_nodes : int
+        number of nodes of the instance, depot included
+
+    Returns
+    -------
+    adjacency : list
+        list indexed by node identifier with the sorted indices of its candidates
+    """
+    ids = pairs.ravel()
+    order = np.argsort(ids, kind='stable')
+    offsets = np.concatenate(([0], np.cumsum(np.bincount(ids, minlength=n_nodes)))).tolist()
+    indices = (order // 2).tolist()
+    adjacency = [indices[offsets[k]:offsets[k + 1]] for k in range(n_nodes)]
+    return adjacency
+
+
+def candidate_partners(pairs: np.ndarray, n_nodes: int) -> list:
+    """
+    Returns, for every node, the identifier of the other node of each of its candidates,
+    in the same order as node_candidates
+
+    Parameters
+    ----------
+    pairs : np.ndarray
+        (m, 2) array with the identifiers of the nodes of each candidate
+    n_nodes : int
+        number of nodes of the instance, depot included
+
+    Returns
+    -------
+    partners : list
+        list indexed by node identifier with the identifiers of the other nodes of its candidates
+    """
+    ids = pairs.ravel()
+    order = np.argsort(ids, kind='stable')
+    offsets = np.concatenate(([0], np.cumsum(np.bincount(ids, minlength=n_nodes)))).tolist()
+    others = ids[order ^ 1].tolist()
+    partners = [others[offsets[k]:offsets[k + 1]] for k in range(n_nodes)]
+    return partners
@@ -0,0 +1,183 @@
+"""
+This module contains the location of the data files and the registry of the vehicle capacities. The data directory
+defaults to the data folder of the repository, wherever the scripts are run from, and can be changed with the
+SAVINGS_DATA_DIR environment variable or with set_data_root.
+"""
+
+from __future__ import annotations
+
+import csv
+import os
+
+DATA_ROOT_VARIABLE = 'SAVINGS_DATA_DIR'
+_DEFAULT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'data')
+_root = None
+
+
+def set_data_root(path: str | None) -> None:
+    """
+    Sets the directory of the data files for the rest of the process
+
+    Parameters
+    ----------
+    path : str or None
+        directory of the data files, if None the environment variable or the default directory is used again
+    """
+    global _root
+    _root = None if path is None else os.path.abspath(path)
+
+
+def data_root() -> str:
+    """
+    Returns the directory of the data files: the one given to set_data_root, else the one in the
+    SAVINGS_DATA_DIR environment variable, else the data folder of the repository
+
+    Returns
+    -------
+    root : str
+        absolute path of the directory
+    """
+    if _root is not None:
+        return _root
+    return os.path.abspath(os.environ.get(DATA_ROOT_VARIABLE) or _DEFAULT_ROOT)
+
+
+def data_path(*parts: str) -> str:
+    """
+    Returns the path of a file or directory inside the data directory
+
+    Parameters
+    ----------
+    parts : str
+        components of the path relative to the data directory
+
+    Returns
+    -------
+    path : str
+        absolute path
+    """
+    return os.path.join(data_root(), *parts)
+
+
+def node_file(instance_name: str) -> str:
+    """
+    Returns the path of the node file of an instance
+
+    Parameters
+    ----------
+    instance_name : str
+        identifier of the instance
+
+    Returns
+    -------
+    path : str
+        absolute path of the file
+    """
+    return data_path('{}_input_nodes.txt'.format(instance_name))
+
+
+def list_instances() -> list:
+    """
+    Returns the identifiers of the instances that have a node file in the data directory
+
+    Returns
+    -------
+    instances : list
+        identifiers of the instances, sorted
+    """
+    suffix = '_input_nodes.txt'
+    return sorted(name[:-len(suffix)] for name in os.listdir(data_root()) if name.endswith(suffix))
+
+
+class CapacityRegistry:
+    """
+    A class to represent the vehicle capacity of every instance, as given by a capacity file
+
+    The file is read the first time a capacity is requested and read again only when its modification
+    time changes, so a lookup does not open the file.
+
+    Attributes
+    ----------
+    path : str
+        path of the capacity file, with a row 'instance,capacity' per instance
+
+    Methods
+    -------
+    __getitem__(instance_name)
+        returns the vehicle capacity of an instance
+    __contains__(instance_name)
+        tells if the file has the capacity of an instance
+    bulk(instance_names)
+        returns the vehicle capacities of several instances
+    """
+    def __init__(self, path: str):
+        """
+        Parameters
+        ----------
+        path : str
+            path of the capacity file
+        """
+        self.path = path
+        self._mtime = None
+        self._capacities = dict()
+
+    def __repr__(self):
+        return 'CapacityRegistry ({})'.format(self.path)
+
+    def _load(self) -> dict:
+        """
+        Returns the capacities by instance, reading the file if it changed since the last time
+        """
+        mtime = os.stat(self.path).st_mtime_ns
+        if mtime != self._mtime:
+            with open(self.path) as file:
+                reader = csv.reader(file)
+                self._capacities = {row[0]: int(row[1]) for row in reader if row}
+            self._mtime = mtime
+        return self._capacities
+
+    def __getitem__(self, instance_name: str) -> int:
+        return self._load()[instance_name]
+
+    def __contains__(self, instance_name: str) -> bool:
+        return instance_name in self._load()
+
+    def bulk(self, instance_names: list = None) -> dict:
+        """
+        Returns the vehicle capacities of several instances with a single check of the file
+
+        Parameters
+        ----------
+        instance_names : list
+            identifiers of the instances, if None every instance of the file
+
+        Returns
+        -------
+        capacities : dict
+            vehicle capacity by instance identifier
+        """
+        capacities = self._load()
+        if instance_names is None:
+            return dict(capacities)
+        return {instance_name: capacities[instance_name] for instance_name in instance_names}
+
+
+# one registry per capacity file, shared by the whole process
+_registries = dict()
+
+
+def capacities() -> CapacityRegistry:
+    """
+    Returns the registry of the capacity file of the current data directory
+
+    Returns
+    -------
+    registry : CapacityRegistry
+        the registry, created the first time the file is used
+    """
+    path = data_path('veh_capacity.txt')
+    registry = _registries.get(path)
+    if registry is None:
+        registry = CapacityRegistry(path)
+        _registries[path] = registry
+    return registry
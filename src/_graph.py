@@ -1,8 +1,10 @@
 """
 This module contains the necessary classes to create a graph solution of Clarke and Wright savings algorithm
-or any metaheuristic modification of it
+or any metaheuristic modification of it. The classes declare __slots__ as a savings list holds two edges
+per pair of nodes.
 """
 
+import copy
 import math
 import matplotlib.pyplot as plt
 import networkx as nx
@@ -23,19 +25,33 @@ class Node:
     demand : int
         demand of the node
     inRoute : Route
-        route which the node belongs to
+        route which the node belongs to, resolved through a disjoint-set forest so that merging two routes
+        does not relabel their nodes
     isInterior : bool
         tells if the route is not connected to the depot node
     dnEdge : Edge
         edge that connects the depot node to the depot
     ndEdge : Edge
         edge that connects the node to the depot node
+    links : tuple
+        edges that connect the node with its neighbours in the route, depot excluded, at most two
 
     Methods
     -------
     __repr__()
         establishes how the class is printed
+    find()
+        returns the representative of the set of nodes that share the route of the node
+    union(node, route)
+        joins the sets of two nodes and assigns them a route
+    link(edge)
+        stores an edge that connects the node with a neighbour in the route
+    unlink()
+        forgets the edges to the neighbours in the route
     """
+    __slots__ = ('ID', 'x', 'y', 'demand', '_parent', '_size', '_route', 'isInterior', 'dnEdge', 'ndEdge',
+                 '_first_link', '_second_link')
+
     def __init__(self, node_id, x, y, demand):
         """
         Parameters
@@ -57,10 +73,86 @@ class Node:
         self.isInterior = False  # an interior node is not connected to depot
         self.dnEdge = None  # edge from depot to this node
         self.ndEdge = None  # edge from node to depot
+        self._first_link = None  # edges to the neighbours in the route
+        self._second_link = None
 
     def __repr__(self):
         return 'Node {}'.format(self.ID)
 
+    @property
+    def inRoute(self):
+        return self.find()._route
+
+    @inRoute.setter
+    def inRoute(self, route):
+        # the node becomes a singleton set, the nodes that pointed to it must be reassigned as well
+        self._parent = self
+        self._size = 1
+        self._route = route
+
+    @property
+    def links(self):
+        if self._second_link is not None:
+            return self._first_link, self._second_link
+        return () if self._first_link is None else (self._first_link,)
+
+    def link(self, edge) -> None:
+        """
+        Stores an edge that connects the node with a neighbour in the route, a node has at most two of them
+
+        Parameters
+        ----------
+        edge : Edge
+            edge between the node and one of its neighbours
+        """
+        if self._first_link is None:
+            self._first_link = edge
+        else:
+            self._second_link = edge
+
+    def unlink(self) -> None:
+        """
+        Forgets the edges to the neighbours in the route, before the node is used in another construction
+        """
+        self._first_link = None
+        self._second_link = None
+
+    def find(self) -> 'Node':
+        """
+        Returns the representative of the set of nodes that share the route of the node, the path to it
+        is halved on the way
+
+        Returns
+        -------
+        root : Node
+            the representative of the set, the only one that stores the route
+        """
+        node = self
+        while node._parent is not node:
+            node._parent = node._parent._parent
+            node = node._parent
+        return node
+
+    def union(self, node: 'Node', route) -> None:
+        """
+        Joins the sets of two nodes by size and assigns the route to the joined set
+
+        Parameters
+        ----------
+        node : Node
+            node of the other set
+        route : Route
+            route of the nodes of both sets
+        """
+        root, other = self.find(), node.find()
+        if root is not other:
+            if root._size < other._size:
+                root, other = other, root
+            other._parent = root
+            other._route = None
+            root._size += other._size
+        root._route = route
+
 
 class Edge:
     """
@@ -72,6 +164,8 @@ class Edge:
         origin node of the edge
     end : Node
         end node of the edge
+    distances : np.ndarray
+        distance matrix of the instance indexed by node identifier, if None the cost is computed
 
     Methods
     -------
@@ -82,7 +176,9 @@ class Edge:
     reverse()
         reverses the direction of the edge
     """
-    def __init__(self, origin, end):
+    __slots__ = ('origin', 'end', 'cost', 'savings', 'invEdge')
+
+    def __init__(self, origin, end, distances=None):
         """
         Parameters
         ----------
@@ -90,10 +186,12 @@ class Edge:
             origin node of the edge
         end : Node
             end node of the edge
+        distances : np.ndarray
+            distance matrix of the instance indexed by node identifier, if None the cost is computed
         """
         self.origin = origin  # origin node of the edge
         self.end = end  # end node of the edge
-        self.cost = abs(self)
+        self.cost = abs(self) if distances is None else float(distances[origin.ID, end.ID])
         self.savings = 0.0
         self.invEdge = None
 
@@ -114,15 +212,21 @@ class Edge:
 
     def reverse(self):
         """
-        Returns the reversed edge by setting the origin of the reversed
-        edge as the end node of the original edge and vice versa.
+        Returns the reversed edge, the origin of the reversed edge being the end node of the original edge
+        and vice versa. The inverse edge is returned if it already exists, otherwise it is created
+        with the same cost and linked to this one.
 
         Returns
         -------
         reversed_edge : Edge
             original edge with reversed origin and endpoint
         """
-        reversed_edge = Edge(self.end, self.origin)
+        if self.invEdge is not None:
+            return self.invEdge
+        reversed_edge = copy.copy(self)
+        reversed_edge.origin, reversed_edge.end = self.end, self.origin
+        reversed_edge.invEdge = self
+        self.invEdge = reversed_edge
         return reversed_edge
 
 
@@ -130,6 +234,26 @@ class Route:
     """
     A class to represent a route
 
+    The route is stored as a doubly linked list of nodes: every node keeps the edges that link it with its
+    neighbours in the route, and the route keeps its endpoints and an orientation flag. Reversing the route
+    flips the flag and appending a route is a splice of the endpoints, the list of edges is only built when
+    it is requested.
+
+    Attributes
+    ----------
+    cost : float
+        cost in distance of the route
+    demand : float
+        total demand covered by the route
+    depot : Node
+        the node from where the route starts
+    first : Node
+        first node visited by the route
+    last : Node
+        last node visited by the route
+    edges : list
+        the set of edges that the route includes, in order
+
     Methods
     -------
     __repr__()
@@ -137,31 +261,58 @@ class Route:
     __iadd__(edge)
         appends to the route the edge passed and modifies the properties of it
     __isub__(edge)
-        subtracts the edge passed and modifies the properties of it
+        subtracts the cost of the edge passed
     reverse()
         reverses the order of the edges in the route
+    nodes()
+        iterates over the nodes of the route in order
+    splice(candidate, route)
+        appends a route to this one through a candidate edge
     """
+    __slots__ = ('cost', 'demand', 'depot', '_ends', '_reversed', '_edges')
+
     def __init__(self):
-        """
-        Parameters
-        ----------
-        cost : float
-            cost in distance of the route
-        edges : list
-            the set of edges that the route includes
-        demand : float
-            total demand covered by the route
-        """
         self.cost = 0.0
-        self.edges = []
         self.demand = 0.0
+        self.depot = None
+        self._ends = [None, None]
+        self._reversed = 0
+        self._edges = None
 
     def __repr__(self):
         return 'Route ({}{})'.format(''.join([f'{edge.origin.ID} -> ' for edge in self.edges]), self.edges[-1].end.ID)
 
+    @property
+    def first(self):
+        return self._ends[self._reversed]
+
+    @property
+    def last(self):
+        return self._ends[1 - self._reversed]
+
+    @property
+    def edges(self):
+        if self._edges is None:
+            if self.first is None:
+                return []
+            edges = [self.first.dnEdge]
+            node, previous = self.first, None
+            while node is not self.last:
+                for edge in node.links:
+                    if edge.end is node:
+                        edge = edge.reverse()
+                    if edge.end is not previous:
+                        break
+                edges.append(edge)
+                node, previous = edge.end, node
+            edges.append(self.last.ndEdge)
+            self._edges = edges
+        return self._edges
+
     def __iadd__(self, edge):
         """
-        Appends to the route the edge passed and modifies the properties of it
+        Appends to the route the edge passed and modifies the properties of it.
+        The first edge must leave the depot and the route is closed by an edge that returns to it.
 
         Parameters
         ----------
@@ -172,15 +323,22 @@ class Route:
         -------
         self
         """
-
+        if self.depot is None:
+            self.depot = edge.origin
+            self._ends = [edge.end, edge.end]
+            self._reversed = 0
+        elif edge.end is not self.depot:
+            edge.origin.link(edge)
+            edge.end.link(edge)
+            self._ends[1 - self._reversed] = edge.end
         self.cost += edge.cost
         self.demand += edge.end.demand
-        self.edges.append(edge)
+        self._edges = None
         return self
 
     def __isub__(self, edge):
         """
-        Subtracts the edge passed and modifies the properties of it
+        Subtracts the cost of the edge passed, used when the edge is replaced by another one
 
         Parameters
         ----------
@@ -192,14 +350,46 @@ class Route:
         self
         """
         self.cost -= edge.cost
-        self.edges.remove(edge)
+        self._edges = None
         return self
 
     def reverse(self):
         """
-        Reverses the order of the edges in the route
+        Reverses the order of the edges in the route by flipping its orientation
+        """
+        self._reversed = 1 - self._reversed
+        self._edges = None
+
+    def nodes(self):
         """
-        self.edges = [edge.reverse() for edge in reversed(self.edges)]
+        Iterates over the nodes of the route in order
+
+        Returns
+        -------
+        nodes : generator
+            the nodes visited by the route
+        """
+        return (edge.end for edge in self.edges[:-1])
+
+    def splice(self, candidate, route):
+        """
+        Appends a route to this one through a candidate edge that links the last node of this route
+        with the first node of the other one. The edges to the depot that are replaced must have been
+        subtracted before.
+
+        Parameters
+        ----------
+        candidate : Edge
+            edge from the last node of this route to the first node of the other route
+        route : Route
+            the route to append
+        """
+        candidate.origin.link(candidate)
+        candidate.end.link(candidate)
+        self._ends[1 - self._reversed] = route.last
+        self.cost += candidate.cost + route.cost
+        self.demand += route.demand
+        self._edges = None
 
 
 class Solution:
@@ -211,7 +401,7 @@ class Solution:
     ID : int
         solution identifier
     routes : list
-        set of routes that the solution contains
+        routes that the solution contains, in the order they were added
     cost : float
         sum of the costs of each route that belongs to the solution
     demand : float
@@ -219,22 +409,38 @@ class Solution:
 
     Methods
     -------
+    __len__()
+        returns the number of routes
     __iadd__(edge)
         appends to the route the route passed and modifies the properties of the solution
     __isub__(edge)
         subtracts the route passed and modifies the properties of the solution
+    from_routes(nodes, routes, distances)
+        builds the solution that visits the nodes of each route in the given order
+    node_routes()
+        returns the routes as lists of node identifiers
+    materialize()
+        builds the list of edges of every route
     plot_routes()
         plots a picture of the solution graph
     """
+    __slots__ = ('ID', '_routes', 'cost', 'demand')
     last_ID = -1
 
     def __init__(self):
         Solution.last_ID += 1
         self.ID = Solution.last_ID
-        self.routes = []
+        self._routes = {}  # insertion ordered, the routes are keys so that removing one is constant time
         self.cost = 0.0
         self.demand = 0.0
 
+    def __len__(self):
+        return len(self._routes)
+
+    @property
+    def routes(self) -> list:
+        return list(self._routes)
+
     def __iadd__(self, route):
         """
         Appends to the solution the route passed and modifies the properties of the solution
@@ -249,7 +455,7 @@ class Solution:
         """
         self.cost += route.cost
         self.demand += route.demand
-        self.routes.append(route)
+        self._routes[route] = None
         return self
 
     def __isub__(self, route):
@@ -266,9 +472,70 @@ class Solution:
         """
         self.cost -= route.cost
         self.demand -= route.demand
-        self.routes.remove(route)
+        del self._routes[route]
         return self
 
+    @classmethod
+    def from_routes(cls, nodes, routes, distances=None):
+        """
+        Builds the solution that visits the nodes of each route in the given order
+
+        Parameters
+        ----------
+        nodes : list
+            the nodes to be supplied, with their edges to the depot already built
+        routes : list
+            for every route, the list of the identifiers of the visited nodes in order, depot excluded
+        distances : np.ndarray
+            distance matrix of the instance indexed by node identifier, if None the costs are computed
+
+        Returns
+        -------
+        solution : Solution
+            the solution with the given routes
+        """
+        solution = cls()
+        for node_ids in routes:
+            route_nodes = [nodes[node_id - 1] for node_id in node_ids]
+            for node in route_nodes:
+                node.unlink()
+            route = Route()
+            route += route_nodes[0].dnEdge
+            for i_node, j_node in zip(route_nodes, route_nodes[1:]):
+                edge = Edge(i_node, j_node, distances)
+                edge.savings = i_node.ndEdge.cost + j_node.dnEdge.cost - edge.cost
+                edge.reverse().savings = edge.savings
+                route += edge
+            route += route_nodes[-1].ndEdge
+
+            for node in route_nodes:
+                node.inRoute = route
+                node.isInterior = True
+            route_nodes[0].isInterior = False
+            route_nodes[-1].isInterior = False
+            solution += route
+        return solution
+
+    def node_routes(self) -> list:
+        """
+        Returns a compact representation of the solution, cheap to store or to send to another process
+
+        Returns
+        -------
+        routes : list
+            for every route, the list of the identifiers of the visited nodes in order, depot excluded
+        """
+        routes = [[edge.end.ID for edge in route.edges[:-1]] for route in self._routes]
+        return routes
+
+    def materialize(self):
+        """
+        Builds the list of edges of every route, after that the solution does not depend on the links
+        stored in the nodes, which are reset when the nodes are used in another construction
+        """
+        for route in self._routes:
+            route.edges
+
     def plot_routes(self):
         """
         Plots the solution graph
@@ -278,7 +545,7 @@ class Solution:
         g = nx.Graph()
 
         # Adds the edges to the Graph object
-        for route in self.routes:
+        for route in self._routes:
             for edge in route.edges:
                 g.add_edge(edge.origin.ID, edge.end.ID)
                 g.add_node(edge.end.ID, coord=(edge.end.x, edge.end.y))
@@ -0,0 +1,199 @@
+"""
+This module contains the prepared instance, the data of an instance that does not change between replicas of
+the savings algorithm so it can be computed once and reused by every construction.
+"""
+
+import numpy as np
+import savings_algorithm
+from _graph import Solution
+from _array_solution import ArraySolution
+from _candidate_list import node_candidates, candidate_partners
+
+
+class PreparedInstance:
+    """
+    A class to represent an instance ready to be solved several times
+
+    Attributes
+    ----------
+    name : str
+        identifier of the instance
+    depot : Node
+        the node from where the routes start
+    nodes : list
+        the nodes to be supplied, with their edges to the depot already built
+    veh_capacity : int
+        max amount of goods a vehicle can carry
+    distances : np.ndarray
+        square matrix of distances indexed by node identifier, None for granular instances
+    pairs : np.ndarray
+        (m, 2) array with the identifiers of the nodes of each candidate, sorted by savings
+    savings : np.ndarray
+        savings of each candidate in descending order
+    candidate_pairs : list
+        the pairs as a list of lists, cheaper to index from Python
+    candidate_savings : list
+        the savings as a list of floats, cheaper to index from Python
+
+    Methods
+    -------
+    __repr__()
+        establishes how the class is printed
+    reset()
+        restores the per-replica state of the nodes and returns the dummy solution
+    reset_arrays()
+        returns the dummy solution stored in arrays
+    build_solution(routes)
+        builds the solution that visits the nodes in the given order
+    adjacency()
+        returns the candidates that touch every node
+    partners()
+        returns the other node of the candidates that touch every node
+    initially_overloaded()
+        returns the candidates whose nodes exceed the vehicle capacity together
+    """
+    def __init__(self, name, depot, nodes, veh_capacity, distances, pairs, savings):
+        """
+        Parameters
+        ----------
+        name : str
+            identifier of the instance
+        depot : Node
+            the node from where the routes start
+        nodes : list
+            the nodes to be supplied
+        veh_capacity : int
+            max amount of goods a vehicle can carry
+        distances : np.ndarray
+            square matrix of distances indexed by node identifier, None for granular instances
+        pairs : np.ndarray
+            (m, 2) array with the identifiers of the nodes of each candidate, sorted by savings
+        savings : np.ndarray
+            savings of each candidate in descending order
+        """
+        self.name = name
+        self.depot = depot
+        self.nodes = nodes
+        self.veh_capacity = veh_capacity
+        self.distances = distances
+        self.pairs = pairs
+        self.savings = savings
+        self.candidate_pairs = pairs.tolist()
+        self.candidate_savings = savings.tolist()
+        self._adjacency = None
+        self._partners = None
+        self._depot_distances = None
+        self._demands = None
+
+    def __repr__(self):
+        return 'PreparedInstance {} ({} nodes, {} candidates)'.format(self.name, len(self.nodes), len(self.savings))
+
+    def reset(self) -> Solution:
+        """
+        Restores the per-replica state of the nodes (route membership and interior flag)
+        and returns the dummy solution where every node has its own route depot-node-depot
+
+        Returns
+        -------
+        solution : Solution
+            initial dummy solution
+        """
+        return savings_algorithm.create_dummy_solution(self.nodes)
+
+    def reset_arrays(self) -> ArraySolution:
+        """
+        Returns the dummy solution where every node has its own route depot-node-depot, stored in arrays
+
+        Returns
+        -------
+        solution : ArraySolution
+            initial dummy solution
+        """
+        if self._depot_distances is None:
+            self._depot_distances = [0.0] + [node.dnEdge.cost for node in self.nodes]
+            self._demands = [0.0] + [node.demand for node in self.nodes]
+        return ArraySolution(self._depot_distances, self._demands, self.veh_capacity)
+
+    def build_solution(self, routes: list) -> Solution:
+        """
+        Builds the solution that visits the nodes of each route in the given order
+
+        Parameters
+        ----------
+        routes : list
+            for every route, the list of the identifiers of the visited nodes in order, depot excluded
+
+        Returns
+        -------
+        solution : Solution
+            the solution with the given routes
+        """
+        solution = Solution.from_routes(self.nodes, routes, self.distances)
+        return solution
+
+    def adjacency(self) -> list:
+        """
+        Returns the candidates that touch every node, computed the first time it is requested
+
+        Returns
+        -------
+        adjacency : list
+            list indexed by node identifier with the indices of the candidates that touch the node
+        """
+        if self._adjacency is None:
+            self._adjacency = node_candidates(self.pairs, len(self.nodes) + 1)
+        return self._adjacency
+
+    def partners(self) -> list:
+        """
+        Returns the other node of the candidates that touch every node, computed the first time it is requested
+
+        Returns
+        -------
+        partners : list
+            list indexed by node identifier with the identifiers of the other nodes of its candidates,
+            in the same order as adjacency
+        """
+        if self._partners is None:
+            self._partners = candidate_partners(self.pairs, len(self.nodes) + 1)
+        return self._partners
+
+    def initially_overloaded(self) -> np.ndarray:
+        """
+        Returns the candidates that can never be merged because the demand of their nodes
+        already exceeds the vehicle capacity
+
+        Returns
+        -------
+        overloaded : np.ndarray
+            indices of the overloaded candidates
+        """
+        demands = np.array([0.0] + [node.demand for node in self.nodes])
+        overloaded = demands[self.pairs[:, 0]] + demands[self.pairs[:, 1]] > self.veh_capacity
+        return np.flatnonzero(overloaded)
+
+
+def prepare_instance(instance_name: str, neighbours: int = None, cache: bool = True) -> PreparedInstance:
+    """
+    Reads an instance and computes the data shared by every replica of the savings algorithm
+
+    Parameters
+    ----------
+    instance_name : str
+        identifier of the instance
+    neighbours : int
+        if given, only the pairs where a node is among the nearest neighbours of the other are candidates
+        and the distance matrix is not computed
+    cache : bool
+        if True the distances and the sorted savings are read from the on-disk cache when available
+
+    Returns
+    -------
+    instance : PreparedInstance
+        the instance with its distances and sorted savings
+    """
+    depot, nodes, veh_capacity, distances, pairs, savings = savings_algorithm.load_instance(instance_name,
+                                                                                           neighbours, cache)
+    savings_algorithm.build_initial_edges(depot, nodes, distances)
+    instance = PreparedInstance(instance_name, depot, nodes, veh_capacity, distances, pairs, savings)
+    return instance
@@ -0,0 +1,209 @@
+"""
+This module contains the on-disk cache of the preprocessed instances. The nodes, the vehicle capacity, the distance
+matrix and the sorted savings of an instance are stored as NumPy arrays in a .npz file named after the instance and
+a hash of the contents of its data files, so a change in the data leads to a new file instead of a stale one.
+The node files are also converted once to binary .npy files that are memory-mapped when read.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+import zipfile
+import numpy as np
+from _data import data_path, node_file
+
+CACHE_VERSION = 1  # changes when the stored arrays change, so the old files are not read
+MMAP_BYTES = 1 << 24  # arrays of at least this size are memory-mapped instead of read
+
+
+def instance_key(instance_name: str, neighbours: int = None) -> str:
+    """
+    Returns the hash that identifies the preprocessed data of an instance
+
+    Parameters
+    ----------
+    instance_name : str
+        identifier of the instance
+    neighbours : int
+        number of nearest neighbours of the granular candidates, None for the full savings list
+
+    Returns
+    -------
+    key : str
+        hexadecimal hash of the node file, the capacity file and the preprocessing options
+    """
+    return _digest('{}|{}'.format(CACHE_VERSION, neighbours),
+                   node_file(instance_name), data_path('veh_capacity.txt'))
+
+
+def cache_dir() -> str:
+    """
+    Returns the directory of the cache files, inside the data directory
+    """
+    return data_path('.cache')
+
+
+def _digest(salt: str, *file_names: str) -> str:
+    """
+    Returns the hexadecimal hash of a string and the contents of some files
+    """
+    digest = hashlib.sha256(salt.encode())
+    for file_name in file_names:
+        with open(file_name, 'rb') as file:
+            digest.update(file.read())
+    return digest.hexdigest()[:16]
+
+
+def cache_path(instance_name: str, neighbours: int = None) -> str:
+    """
+    Returns the path of the cache file of an instance
+
+    Parameters
+    ----------
+    instance_name : str
+        identifier of the instance
+    neighbours : int
+        number of nearest neighbours of the granular candidates, None for the full savings list
+
+    Returns
+    -------
+    path : str
+        path of the .npz file, it may not exist yet
+    """
+    suffix = '' if neighbours is None else '_k{}'.format(neighbours)
+    key = instance_key(instance_name, neighbours)
+    return os.path.join(cache_dir(), '{}{}_{}.npz'.format(instance_name, suffix, key))
+
+
+def _memory_map_member(path: str, info: zipfile.ZipInfo) -> np.memmap:
+    """
+    Memory-maps an array stored without compression in a .npz file
+    """
+    with open(path, 'rb') as file:
+        # the data of the member starts after its local header, whose name and extra fields have variable length
+        file.seek(info.header_offset)
+        name_length, extra_length = struct.unpack('<HH', file.read(30)[26:30])
+        file.seek(info.header_offset + 30 + name_length + extra_length)
+        version = np.lib.format.read_magic(file)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+        offset = file.tell()
+    return np.memmap(path, dtype=dtype, mode='r', shape=shape, order='F' if fortran_order else 'C', offset=offset)
+
+
+def load_arrays(path: str) -> dict | None:
+    """
+    Reads the arrays of a cache file, the large ones are memory-mapped
+
+    Parameters
+    ----------
+    path : str
+        path of the .npz file
+
+    Returns
+    -------
+    arrays : dict or None
+        the arrays by name, None if the file does not exist or can not be read
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        arrays = dict()
+        with zipfile.ZipFile(path) as archive, np.load(path) as data:
+            for info in archive.infolist():
+                name = info.filename[:-len('.npy')]
+                if info.compress_type == zipfile.ZIP_STORED and info.file_size >= MMAP_BYTES:
+                    arrays[name] = _memory_map_member(path, info)
+                else:
+                    arrays[name] = data[name]
+        return arrays
+    except (OSError, ValueError, zipfile.BadZipFile):
+        return None
+
+
+def _write_atomically(path: str, write) -> bool:
+    """
+    Writes a file under a temporary name and then renames it, so several processes can fill the cache at once.
+    The cache is only an optimization, a directory that can not be written is not an error.
+
+    Parameters
+    ----------
+    path : str
+        path of the file
+    write : function
+        function that receives the open file and writes the contents
+
+    Returns
+    -------
+    written : bool
+        False if the file could not be written
+    """
+    temporary = '{}.{}.tmp'.format(path, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temporary, 'wb') as file:
+            write(file)
+        os.replace(temporary, path)
+        return True
+    except OSError:
+        if os.path.exists(temporary):
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+        return False
+
+
+def save_arrays(path: str, **arrays: np.ndarray) -> bool:
+    """
+    Writes the arrays to a cache file without compression, so they can be memory-mapped
+
+    Parameters
+    ----------
+    path : str
+        path of the .npz file
+    arrays : np.ndarray
+        the arrays to store by name
+
+    Returns
+    -------
+    written : bool
+        False if the cache directory can not be written
+    """
+    return _write_atomically(path, lambda file: np.savez(file, **arrays))
+
+
+def load_node_array(instance_name: str, cache: bool = True) -> np.ndarray:
+    """
+    Returns the coordinates and the demand of the nodes of an instance as an array. The node file is parsed
+    in bulk and converted to a .npy file the first time, the next times that file is memory-mapped.
+
+    Parameters
+    ----------
+    instance_name : str
+        identifier of the instance
+    cache : bool
+        if False the node file is always parsed and nothing is written to the cache directory
+
+    Returns
+    -------
+    data : np.ndarray
+        (n + 1, 3) array with the coordinates and the demand of every node, the depot in the first row
+    """
+    file_name = node_file(instance_name)
+    if cache:
+        path = os.path.join(cache_dir(), '{}_nodes_{}.npy'.format(instance_name, _digest('nodes', file_name)))
+        try:
+            return np.load(path, mmap_mode='r')
+        except (OSError, ValueError):
+            pass
+
+    with open(file_name, 'rb') as file:
+        data = np.array(file.read().split(), dtype=float).reshape(-1, 3)
+    if not cache or not _write_atomically(path, lambda file: np.save(file, data)):
+        return data
+    return np.load(path, mmap_mode='r')
@@ -0,0 +1,104 @@
+"""
+This module contains the tracking of the loads of the routes of a solution under construction. It tells when no
+pair of routes fits in a vehicle anymore, so the construction can stop before going through the rest of the savings
+list.
+"""
+
+import heapq
+
+
+class RouteLoads:
+    """
+    A class to represent the multiset of the loads of the routes of a solution
+
+    The loads are kept in a heap, the loads of the merged routes are deleted lazily when they reach the top.
+    Every route keeps its two ends connected to the depot, so two routes can only be merged if the sum of their
+    loads does not exceed the vehicle capacity. When the two smallest loads exceed it no merge is possible.
+
+    Attributes
+    ----------
+    veh_capacity : int
+        max amount of goods a vehicle can carry
+    mergeable : bool
+        False when there are less than two routes or the two smallest loads exceed the vehicle capacity
+    smallest : float
+        smallest load of the routes
+
+    Methods
+    -------
+    __len__()
+        returns the number of routes
+    merge(i_load, j_load, load)
+        replaces the loads of two merged routes by the load of the resulting route
+    """
+    def __init__(self, loads: list, veh_capacity: int):
+        """
+        Parameters
+        ----------
+        loads : list
+            load of every route of the initial solution
+        veh_capacity : int
+            max amount of goods a vehicle can carry
+        """
+        self.veh_capacity = veh_capacity
+        self._heap = list(loads)
+        heapq.heapify(self._heap)
+        self._deleted = dict()
+        self._length = len(self._heap)
+        self.mergeable = self._two_smallest_fit()
+
+    def __len__(self):
+        return self._length
+
+    def __repr__(self):
+        return 'RouteLoads ({} routes, mergeable = {})'.format(self._length, self.mergeable)
+
+    def _pop(self) -> float:
+        """
+        Removes and returns the smallest load that has not been deleted
+        """
+        heap, deleted = self._heap, self._deleted
+        load = heapq.heappop(heap)
+        while load in deleted:
+            if deleted[load] == 1:
+                del deleted[load]
+            else:
+                deleted[load] -= 1
+            load = heapq.heappop(heap)
+        return load
+
+    def _two_smallest_fit(self) -> bool:
+        """
+        Tells if the two smallest loads fit together in a vehicle, and updates the smallest load
+        """
+        if self._length == 0:
+            self.smallest = None
+            return False
+        first = self._pop()
+        self.smallest = first
+        if self._length < 2:
+            heapq.heappush(self._heap, first)
+            return False
+        second = self._pop()
+        heapq.heappush(self._heap, first)
+        heapq.heappush(self._heap, second)
+        return first + second <= self.veh_capacity
+
+    def merge(self, i_load: float, j_load: float, load: float) -> None:
+        """
+        Replaces the loads of two merged routes by the load of the resulting route
+
+        Parameters
+        ----------
+        i_load : float
+            load of a merged route before the merge
+        j_load : float
+            load of the other merged route before the merge
+        load : float
+            load of the route resulting from the merge
+        """
+        self._deleted[i_load] = self._deleted.get(i_load, 0) + 1
+        self._deleted[j_load] = self._deleted.get(j_load, 0) + 1
+        heapq.heappush(self._heap, load)
+        self._length -= 1
+        self.mergeable = self._two_smallest_fit()
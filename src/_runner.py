@@ -0,0 +1,380 @@
+"""
+This module contains the runner of the experiments over the instances. Every (instance, configuration) pair is a job,
+the jobs are performed in a pool of processes starting by the largest instances and every result is appended
+to a csv file as soon as it is known, so an interrupted run resumes from the jobs that are not in the file yet.
+The sweep of the parameter of the geometrical distribution over a single instance prepares it only once, and the
+adaptive sweep spends a budget of replicas on the configurations that look promising by successive halving.
+"""
+
+from __future__ import annotations
+
+import csv
+import os
+import time
+import warnings
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from savings_algorithm import cw_savings
+from random_biased_savings import (iter_geometrical_rand_biased_savings, iter_triangular_rand_biased_savings,
+                                   replica_costs)
+from _instance import PreparedInstance, prepare_instance
+from _instance_cache import load_node_array
+from _biased_random_theorical_distribution import TriangularSampler, GeometricSampler
+
+FIELDS = ['instance', 'configuration', 'cost', 'seconds']
+
+
+def default_configurations(replicas: int) -> list:
+    """
+    Returns the configurations of the test of the theoretical distributions: the savings algorithm,
+    the triangular distribution and the geometrical distribution with beta from 0.1 to 0.9
+
+    Parameters
+    ----------
+    replicas : int
+        number of replicas of the random biased searches
+
+    Returns
+    -------
+    configurations : list
+        (label, distribution, beta) of every configuration, beta is None if not used
+    """
+    configurations = [('original', 'original', None),
+                      (f'triangular n={replicas}', 'triangular', None)]
+    for k in range(1, 10):
+        beta = k / 10
+        configurations.append((f'geometrical n={replicas}, beta={beta}', 'geometrical', beta))
+    return configurations
+
+
+def run_job(instance: str, configuration: tuple, replicas: int, seed: np.random.SeedSequence = None) -> tuple:
+    """
+    Solves an instance with a configuration
+
+    Parameters
+    ----------
+    instance : str
+        identifier of the instance
+    configuration : tuple
+        (label, distribution, beta) of the configuration, distribution is 'original', 'triangular' or 'geometrical'
+    replicas : int
+        number of replicas of the random biased searches
+    seed : SeedSequence
+        seed of the random biased searches, if None fresh entropy is used
+
+    Returns
+    -------
+    cost : float
+        cost of the best solution found
+    seconds : float
+        time spent to solve the instance
+    """
+    label, distribution, beta = configuration
+    start = time.perf_counter()
+    if distribution == 'original':
+        solution = cw_savings(instance)
+    elif distribution == 'triangular':
+        solution = iter_triangular_rand_biased_savings(instance, replicas, seed=seed)
+    elif distribution == 'geometrical':
+        solution = iter_geometrical_rand_biased_savings(instance, beta, replicas, seed=seed)
+    else:
+        raise ValueError('unknown distribution {!r}'.format(distribution))
+    return solution.cost, time.perf_counter() - start
+
+
+def read_results(results_file: str) -> pd.DataFrame:
+    """
+    Reads the results recorded in a file, the rows that were not completely written are ignored
+
+    Parameters
+    ----------
+    results_file : str
+        path of the csv file with a row per job
+
+    Returns
+    -------
+    results : pd.DataFrame
+        a row per job with the instance, the configuration, the cost and the seconds spent
+    """
+    rows = list()
+    if os.path.exists(results_file):
+        with open(results_file, newline='') as file:
+            for row in csv.DictReader(file):
+                try:
+                    rows.append({'instance': row['instance'], 'configuration': row['configuration'],
+                                 'cost': float(row['cost']), 'seconds': float(row['seconds'])})
+                except (TypeError, ValueError):
+                    continue
+    return pd.DataFrame(rows, columns=FIELDS)
+
+
+def _open_results(results_file: str):
+    """
+    Opens the results file to append rows, writing the header if the file is new and finishing
+    the last line if the previous run was interrupted while writing it
+    """
+    exists = os.path.exists(results_file) and os.path.getsize(results_file) > 0
+    if exists:
+        with open(results_file, 'rb') as file:
+            file.seek(-1, os.SEEK_END)
+            complete = file.read(1) == b'\n'
+    file = open(results_file, 'a', newline='')
+    if not exists:
+        csv.writer(file).writerow(FIELDS)
+    elif not complete:
+        file.write('\n')
+    return file
+
+
+def run_experiments(instances: list, configurations: list, replicas: int, results_file: str,
+                    workers: int = None, seed: int = None) -> pd.DataFrame:
+    """
+    Solves every instance with every configuration and records the results, the jobs already recorded
+    in the results file are skipped
+
+    Parameters
+    ----------
+    instances : list
+        identifiers of the instances
+    configurations : list
+        (label, distribution, beta) of every configuration, see default_configurations
+    replicas : int
+        number of replicas of the random biased searches
+    results_file : str
+        path of the csv file where a row is appended per job
+    workers : int
+        number of processes that perform the jobs, if None the number of processors
+    seed : int
+        seed of the whole experiment, every job receives its own stream that does not depend on
+        the jobs already recorded. If None fresh entropy is used
+
+    Returns
+    -------
+    results : pd.DataFrame
+        a row per job with the instance, the configuration, the cost and the seconds spent
+
+    Raises
+    ------
+    RuntimeError
+        if any job failed, once the rest of the jobs are recorded
+    """
+    done = set(map(tuple, read_results(results_file)[['instance', 'configuration']].values.tolist()))
+    root = np.random.SeedSequence(seed)
+    jobs = list()
+    for i, instance in enumerate(instances):
+        for j, configuration in enumerate(configurations):
+            if (instance, configuration[0]) not in done:
+                job_seed = np.random.SeedSequence(root.entropy, spawn_key=(i, j))
+                jobs.append((instance, configuration, job_seed))
+
+    # the largest instances first, so the pool is not left waiting for one of them at the end
+    sizes = {instance: len(load_node_array(instance)) for instance in instances}
+    jobs.sort(key=lambda job: sizes[job[0]], reverse=True)
+
+    failures = list()
+    with _open_results(results_file) as file, ProcessPoolExecutor(max_workers=workers) as executor:
+        writer = csv.writer(file)
+        futures = {executor.submit(run_job, instance, configuration, replicas, job_seed): (instance, configuration)
+                   for instance, configuration, job_seed in jobs}
+        try:
+            for future in as_completed(futures):
+                instance, configuration = futures[future]
+                try:
+                    cost, seconds = future.result()
+                except Exception as error:
+                    # a failed job is not recorded, so it is performed again when the run is resumed
+                    failures.append((instance, configuration[0], error))
+                    warnings.warn('job ({}, {}) failed: {!r}'.format(instance, configuration[0], error))
+                    continue
+                writer.writerow([instance, configuration[0], repr(cost), repr(seconds)])
+                file.flush()
+        finally:
+            # when the run is aborted the queued jobs are dropped instead of performed for nothing
+            for future in futures:
+                future.cancel()
+
+    if failures:
+        raise RuntimeError('{} of {} jobs failed: {}'.format(
+            len(failures), len(jobs), ', '.join('({}, {})'.format(instance, label)
+                                                for instance, label, _ in failures))) from failures[0][2]
+    return read_results(results_file)
+
+
+def pivot_results(results: pd.DataFrame, configurations: list = None) -> pd.DataFrame:
+    """
+    Returns the costs with a row per instance and a column per configuration
+
+    Parameters
+    ----------
+    results : pd.DataFrame
+        a row per job, as returned by run_experiments
+    configurations : list
+        configurations whose columns are kept and in which order, if None all of them
+
+    Returns
+    -------
+    costs : pd.DataFrame
+        the cost of every instance with every configuration
+    """
+    costs = results.pivot_table(index='instance', columns='configuration', values='cost', aggfunc='last')
+    costs = costs.sort_index()
+    costs.index.name = None
+    costs.columns.name = None
+    if configurations is not None:
+        costs = costs[[label for label, _, _ in configurations if label in costs.columns]]
+    return costs
+
+
+def beta_sweep(instance: str | PreparedInstance, betas: list, iterations: int, triangular: bool = False,
+               purge: bool = False, seed: int = None, engine: str = 'graph') -> pd.DataFrame:
+    """
+    Performs the random biased savings algorithm over an instance with the geometrical distribution for every
+    beta, and optionally with the triangular distribution. The instance is prepared once for all of them.
+
+    Parameters
+    ----------
+    instance : str or PreparedInstance
+        identifier of the instance or the instance already prepared
+    betas : list
+        parameters of the geometrical distribution
+    iterations : int
+        number of replicas of every configuration
+    triangular : bool
+        if True the triangular distribution is also performed, in the first row
+    purge : bool
+        if True the candidates that can not be merged anymore are deleted from the savings list
+    seed : int
+        seed of the sweep, every configuration receives its own stream. If None fresh entropy is used
+    engine : str
+        'graph' to merge Route and Edge objects, 'array' to merge routes stored in an ArraySolution
+
+    Returns
+    -------
+    results : pd.DataFrame
+        a row per configuration with the distribution, the beta, the number of replicas, the best, mean and
+        standard deviation of the costs of the replicas and the seconds spent. The seconds spent to prepare
+        the instance are in results.attrs['preparation_seconds']
+    """
+    start = time.perf_counter()
+    if isinstance(instance, str):
+        instance = prepare_instance(instance)
+    preparation_seconds = time.perf_counter() - start
+
+    configurations = [('triangular', None, TriangularSampler())] if triangular else []
+    configurations += [('geometrical', beta, GeometricSampler(beta)) for beta in betas]
+    seeds = np.random.SeedSequence(seed).spawn(len(configurations))
+
+    rows = list()
+    for (distribution, beta, sampler), configuration_seed in zip(configurations, seeds):
+        start = time.perf_counter()
+        costs, _ = replica_costs(instance, iterations, sampler, purge, configuration_seed, engine)
+        seconds = time.perf_counter() - start
+        std = costs.std(ddof=1) if iterations > 1 else 0.0
+        rows.append({'instance': instance.name, 'distribution': distribution, 'beta': beta, 'replicas': iterations,
+                     'best': costs.min(), 'mean': costs.mean(), 'std': std, 'seconds': seconds})
+    results = pd.DataFrame(rows)
+    results.attrs['preparation_seconds'] = preparation_seconds
+    return results
+
+
+def adaptive_sweep(instance: str | PreparedInstance, betas: list, budget: int, triangular: bool = False,
+                   eta: int = 2, min_replicas: int = 5, purge: bool = False, seed: int = None,
+                   engine: str = 'graph') -> tuple:
+    """
+    Distributes a budget of replicas among the configurations of a sweep by successive halving. In every round
+    the remaining configurations receive the same share of the budget of the round and only the best 1 / eta
+    of them, by the best cost found so far, go on to the next round, so the replicas concentrate on the
+    promising configurations. The last configurations receive the rest of the budget.
+
+    Parameters
+    ----------
+    instance : str or PreparedInstance
+        identifier of the instance or the instance already prepared
+    betas : list
+        parameters of the geometrical distribution
+    budget : int
+        total number of replicas to perform, at least one per configuration and round. The shares of the
+        configurations are rounded down and not lower than min_replicas while the budget allows it
+    triangular : bool
+        if True the triangular distribution is also a candidate configuration
+    eta : int
+        inverse of the fraction of configurations kept after every round, at least 2
+    min_replicas : int
+        min number of replicas of a configuration in a round, unless the budget left does not allow it
+    purge : bool
+        if True the candidates that can not be merged anymore are deleted from the savings list
+    seed : int
+        seed of the sweep, every configuration receives its own stream and its replicas in later rounds
+        continue it. If None fresh entropy is used
+    engine : str
+        'graph' to merge Route and Edge objects, 'array' to merge routes stored in an ArraySolution
+
+    Returns
+    -------
+    results : pd.DataFrame
+        a row per configuration with the distribution, the beta, the number of replicas, the best, mean and
+        standard deviation of the costs of the replicas, the seconds spent and the round in which it was
+        discarded, None for the configurations that reached the end
+    best : Solution
+        the solution with the lowest cost found by any configuration
+    """
+    if eta < 2:
+        raise ValueError('eta must be at least 2, not {}'.format(eta))
+    if isinstance(instance, str):
+        instance = prepare_instance(instance)
+
+    configurations = [('triangular', None, TriangularSampler())] if triangular else []
+    configurations += [('geometrical', beta, GeometricSampler(beta)) for beta in betas]
+    seeds = np.random.SeedSequence(seed).spawn(len(configurations))
+    costs = [list() for _ in configurations]
+    seconds = [0.0] * len(configurations)
+    discarded = [None] * len(configurations)
+
+    # number of configurations of every round, until eta ** rounds covers all of them
+    sizes = [len(configurations)]
+    while eta ** len(sizes) < len(configurations):
+        sizes.append(-(-sizes[-1] // eta))
+    rounds = len(sizes)
+    if budget < sum(sizes):
+        raise ValueError('the budget must be at least {} replicas, one per configuration and round, not {}'.format(
+            sum(sizes), budget))
+
+    alive = list(range(len(configurations)))
+    remaining = budget
+    best = None
+    for r in range(rounds):
+        # the last round spends the rest of the budget, the others leave a replica per configuration of the
+        # next rounds
+        if r == rounds - 1:
+            replicas = remaining // len(alive)
+        else:
+            replicas = max(min_replicas, budget // rounds // len(alive))
+            replicas = min(replicas, (remaining - sum(sizes[r + 1:])) // len(alive))
+        for k in alive:
+            start = time.perf_counter()
+            # the seed of the configuration is shared by its rounds, the offset continues the same stream
+            round_costs, round_best = replica_costs(instance, replicas, configurations[k][2], purge, seeds[k], engine,
+                                                    offset=len(costs[k]))
+            seconds[k] += time.perf_counter() - start
+            costs[k].extend(round_costs.tolist())
+            if best is None or round_best.cost < best.cost:
+                best = round_best
+        remaining -= replicas * len(alive)
+        if r < rounds - 1:
+            alive.sort(key=lambda k: (min(costs[k]), np.mean(costs[k])))
+            survivors = sizes[r + 1]
+            for k in alive[survivors:]:
+                discarded[k] = r
+            alive = alive[:survivors]
+
+    rows = list()
+    for k, (distribution, beta, _) in enumerate(configurations):
+        if not costs[k]:
+            continue
+        std = np.std(costs[k], ddof=1) if len(costs[k]) > 1 else 0.0
+        rows.append({'instance': instance.name, 'distribution': distribution, 'beta': beta,
+                     'replicas': len(costs[k]), 'best': min(costs[k]), 'mean': np.mean(costs[k]), 'std': std,
+                     'seconds': seconds[k], 'discarded': discarded[k]})
+    results = pd.DataFrame(rows)
+    return results, best
@@ -0,0 +1,98 @@
+"""
+This script measures the memory footprint of the graph classes on the largest instances. The slotted classes
+of _graph are compared against standalone classes backed by a per-instance dictionary, with the attributes the
+classes had before declaring __slots__.
+"""
+
+import math
+import tracemalloc
+import pandas as pd
+import savings_algorithm
+from _graph import Node, Edge
+from _data import list_instances
+
+
+class DictNode:
+    """
+    Node with a per-instance dictionary, as the class was before declaring __slots__
+    """
+    def __init__(self, node_id, x, y, demand):
+        self.ID = node_id
+        self.x = x
+        self.y = y
+        self.demand = demand
+        self.inRoute = None
+        self.isInterior = False
+        self.dnEdge = None
+        self.ndEdge = None
+
+
+class DictEdge:
+    """
+    Edge with a per-instance dictionary, as the class was before declaring __slots__
+    """
+    def __init__(self, origin, end):
+        self.origin = origin
+        self.end = end
+        self.cost = math.sqrt((origin.x - end.x) ** 2 + (origin.y - end.y) ** 2)
+        self.savings = 0.0
+        self.invEdge = None
+
+
+def measure(node_class: type, edge_class: type, data: list) -> tuple:
+    """
+    Returns the memory allocated to build the nodes and the two edges of every pair of nodes of an instance
+
+    Parameters
+    ----------
+    node_class : type
+        class of the nodes
+    edge_class : type
+        class of the edges
+    data : list
+        identifier, coordinates and demand of every node, depot excluded
+
+    Returns
+    -------
+    node_bytes : int
+        memory allocated by the nodes
+    edge_bytes : int
+        memory allocated by the edges
+    n_edges : int
+        number of edges built
+    """
+    tracemalloc.start()
+    nodes = [node_class(*row) for row in data]
+    node_bytes = tracemalloc.get_traced_memory()[0]
+    edges = list()
+    for i, i_node in enumerate(nodes):
+        for j_node in nodes[i + 1:]:
+            ij_edge = edge_class(i_node, j_node)
+            ji_edge = edge_class(j_node, i_node)
+            ij_edge.invEdge, ji_edge.invEdge = ji_edge, ij_edge
+            edges.append(ij_edge)
+    edge_bytes = tracemalloc.get_traced_memory()[0] - node_bytes
+    tracemalloc.stop()
+    return node_bytes, edge_bytes, 2 * len(edges)
+
+
+if __name__ == '__main__':
+    # read the instances and keep the largest ones
+    instances = list_instances()
+    instances.sort(key=lambda x: int(x.split('-')[1][1:]), reverse=True)
+    largest = instances[:3]
+
+    footprint = dict()
+    for instance in largest:
+        depot, nodes, veh_capacity = savings_algorithm.read_nodes(instance)
+        data = [(node.ID, node.x, node.y, node.demand) for node in nodes]
+        for label, node_class, edge_class in [('slots', Node, Edge), ('dict', DictNode, DictEdge)]:
+            node_bytes, edge_bytes, n_edges = measure(node_class, edge_class, data)
+            footprint[(instance, label)] = {'nodes': len(data),
+                                            'bytes per node': node_bytes / len(data),
+                                            'edges': n_edges,
+                                            'bytes per edge': edge_bytes / n_edges,
+                                            'total MB': (node_bytes + edge_bytes) / 2 ** 20}
+
+    results = pd.DataFrame(footprint).T
+    print(results.round(2))
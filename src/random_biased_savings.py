@@ -2,79 +2,651 @@
 This module contains the functions to perform random biased savings algorithms with different functions
 """
 
+from __future__ import annotations
+
+import time
 import numpy as np
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from types import FunctionType
 import savings_algorithm
-from _graph import Solution
-from _biased_random_theorical_distribution import get_random_position
+from _graph import Node, Solution
+from _array_solution import ArraySolution
+from _candidate_list import CandidateList, CandidateWindow
+from _route_loads import RouteLoads
+from _instance import PreparedInstance, prepare_instance
+from _biased_random_theorical_distribution import (UniformStream, PositionSampler, TriangularSampler,
+                                                    GeometricSampler, TruncatedGeometricSampler, as_sampler)
+
+
+def _purge_dead_candidates(candidates: CandidateList, adjacency: list, partners: list, nodes: list,
+                           i_node: Node, j_node: Node, loads: RouteLoads, veh_capacity: int) -> None:
+    """
+    Deletes the candidates that can not be merged anymore after joining the routes of two nodes.
+    A candidate never becomes joinable again once:
+        - One of its nodes is interior
+        - OR both nodes belong to the same route
+        - OR the sum of the demand of both routes is greater than the vehicle capacity
+    When the new route does not fit with the route of smallest load, every candidate of its endpoints
+    is deleted without checking them one by one.
+
+    Parameters
+    ----------
+    candidates : CandidateList
+        live candidates of the savings list
+    adjacency : list
+        list indexed by node identifier with the indices of the candidates that touch the node
+    partners : list
+        list indexed by node identifier with the other node of the candidates that touch the node
+    nodes : list
+        the nodes to be supplied
+    i_node : Node
+        merged node
+    j_node : Node
+        merged node
+    loads : RouteLoads
+        loads of the routes, already updated with the merge
+    veh_capacity : int
+        max amount of goods a vehicle can carry
+    """
+    for node in (i_node, j_node):
+        if node.isInterior:
+            candidates.remove_many(adjacency[node.ID])
+
+    # only the candidates of the endpoints of the new route are affected by its demand and membership
+    route = i_node.inRoute
+    room = veh_capacity - route.demand
+    for node in {route.first, route.last}:
+        if loads.smallest > room:
+            candidates.remove_many(adjacency[node.ID])
+            continue
+        dead = list()
+        for index, other_id in zip(adjacency[node.ID], partners[node.ID]):
+            other_route = nodes[other_id - 1].inRoute
+            if other_route is route or other_route.demand > room:
+                dead.append(index)
+        candidates.remove_many(dead)
 
 
-def rand_biased_savings(instance_name: str, rand_function: FunctionType) -> Solution:
+def _purge_dead_array_candidates(candidates: CandidateList, adjacency: list, partners: list,
+                                 solution: ArraySolution, i: int, j: int, loads: RouteLoads) -> None:
+    """
+    Deletes the candidates that can not be merged anymore after joining the routes of two nodes
+    of an array solution, see _purge_dead_candidates
+
+    Parameters
+    ----------
+    candidates : CandidateList
+        live candidates of the savings list
+    adjacency : list
+        list indexed by node identifier with the indices of the candidates that touch the node
+    partners : list
+        list indexed by node identifier with the other node of the candidates that touch the node
+    solution : ArraySolution
+        solution that is being constructed
+    i : int
+        identifier of a merged node
+    j : int
+        identifier of a merged node
+    loads : RouteLoads
+        loads of the routes, already updated with the merge
+    """
+    for node in (i, j):
+        if solution.is_interior(node):
+            candidates.remove_many(adjacency[node])
+
+    route_id, load = solution.route_id, solution.load
+    route = route_id[i]
+    room = solution.veh_capacity - load[route]
+    for node in {solution.head[route], solution.tail[route]}:
+        if loads.smallest > room:
+            candidates.remove_many(adjacency[node])
+            continue
+        candidates.remove_many([index for index, other in zip(adjacency[node], partners[node])
+                                if route_id[other] == route or load[route_id[other]] > room])
+
+
+def _construct(instance: PreparedInstance, rand_function: PositionSampler | FunctionType | np.ndarray,
+               purge: bool, rng: np.random.Generator | int, engine: str,
+               window: int = None) -> Solution | ArraySolution:
+    """
+    Performs the construction of a random biased savings algorithm with the given representation of the solution
+
+    Parameters
+    ----------
+    instance : PreparedInstance
+        the instance already prepared
+    rand_function : PositionSampler, function or np.ndarray
+        the sampler of positions, the distribution probability function or the weights of the positions
+    purge : bool
+        if True the candidates that can not be merged anymore are deleted from the savings list
+    rng : Generator, int or SeedSequence
+        generator of the random numbers or seed to create it
+    engine : str
+        'graph' to build Route and Edge objects or 'array' to build an ArraySolution
+    window : int
+        if given, the selection is restricted to the first live candidates up to this number
+
+    Returns
+    -------
+    solution : Solution or ArraySolution
+        the solution achieved by the random biased savings algorithm
+    """
+    if engine not in ('graph', 'array'):
+        raise ValueError("engine must be 'graph' or 'array', not {!r}".format(engine))
+
+    # Algorithm initialization, only the routes have to be built again for a prepared instance
+    depot, nodes, veh_capacity = instance.depot, instance.nodes, instance.veh_capacity
+    pairs, savings = instance.candidate_pairs, instance.candidate_savings
+    distances = instance.distances
+    candidates = CandidateList(len(pairs)) if window is None else CandidateWindow(len(pairs), window)
+    solution = instance.reset() if engine == 'graph' else instance.reset_arrays()
+    sampler = as_sampler(rand_function)
+    uniform = UniformStream(rng)
+
+    if purge:
+        adjacency, partners = instance.adjacency(), instance.partners()
+        for index in instance.initially_overloaded().tolist():
+            candidates.remove(index)
+
+    # Algorithm iteration process of merging routes, until no pair of routes fits in a vehicle
+    if engine == 'array':
+        loads = RouteLoads(solution.load[1:], veh_capacity)
+        while len(candidates) > 0 and loads.mergeable:
+            position = sampler.sample(len(candidates), uniform)
+            index = candidates.pop(position)
+            i, j = pairs[index]
+            if solution.is_joinable(i, j):
+                i_load, j_load = solution.load[solution.route_id[i]], solution.load[solution.route_id[j]]
+                solution.merge(i, j, savings[index])
+                loads.merge(i_load, j_load, solution.load[solution.route_id[i]])
+                if purge:
+                    _purge_dead_array_candidates(candidates, adjacency, partners, solution, i, j, loads)
+        return solution
+
+    loads = RouteLoads([route.demand for route in solution.routes], veh_capacity)
+    while len(candidates) > 0 and loads.mergeable:
+        position = sampler.sample(len(candidates), uniform)
+        index = candidates.pop(position)
+        i, j = pairs[index]
+        i_node, j_node = nodes[i - 1], nodes[j - 1]
+        if savings_algorithm._is_joinable(i_node, j_node, veh_capacity):
+            i_load, j_load = i_node.inRoute.demand, j_node.inRoute.demand
+            candidate = savings_algorithm.build_candidate_edge(i_node, j_node, savings[index], distances)
+            savings_algorithm.merge_routes(candidate, solution, depot, veh_capacity)
+            loads.merge(i_load, j_load, i_node.inRoute.demand)
+            if purge:
+                _purge_dead_candidates(candidates, adjacency, partners, nodes, i_node, j_node, loads, veh_capacity)
+    return solution
+
+
+def rand_biased_savings(instance: str | PreparedInstance,
+                        rand_function: PositionSampler | FunctionType | np.ndarray,
+                        purge: bool = False, rng: np.random.Generator | int = None,
+                        engine: str = 'graph', window: int = None) -> Solution:
     """
     Performs a random biased savings algorithm given an instance and the theoretical distribution function
     of the desired biased effect to apply to the algorithm
 
     Parameters
     ----------
-    instance_name : str
-        identifier of the instance
-    rand_function : function
-        the function that models how the distribution probability is constructed
+    instance : str or PreparedInstance
+        identifier of the instance or the instance already prepared
+    rand_function : PositionSampler, function or np.ndarray
+        the sampler of positions or the function that models how the distribution probability is constructed,
+        a function receives the length of the list minus one and a uniform random number, or only the length
+        as in the original form, in which case it draws its own random numbers and the seed does not apply.
+        A vector of weights of the positions by rank is sampled with an AliasSampler
+    purge : bool
+        if True the candidates that can not be merged anymore are deleted from the savings list,
+        so the selection is only performed among feasible candidates and the construction finishes
+        as soon as no feasible merge remains. It changes the sampling distribution, and it pays off in time
+        for strongly biased samplers, with nearly uniform ones the loads already stop the construction early
+    rng : Generator, int or SeedSequence
+        generator of the random numbers or seed to create it, the same seed replays the same solution
+    engine : str
+        'graph' to merge Route and Edge objects, 'array' to merge routes stored in an ArraySolution
+        that is exported to a Solution at the end. Both engines build the same routes
+    window : int
+        if given, the positions are drawn among the first live candidates up to this number, so the cost
+        of a draw does not depend on the length of the savings list. The sampler receives the length of the
+        window, a TruncatedGeometricSampler keeps the geometric bias renormalized to it
 
     Returns
     -------
     solution : Solution
         the solution achieved by the random biased savings algorithm
     """
+    if isinstance(instance, str):
+        instance = prepare_instance(instance)
+    solution = _construct(instance, rand_function, purge, rng, engine, window)
+    if engine == 'array':
+        solution = solution.to_solution(instance.nodes, instance.distances)
+    solution.materialize()
+    return solution
 
-    # Algorithm initialization
-    depot, nodes, veh_capacity = savings_algorithm.read_nodes(instance_name)
-    savings_algorithm.build_initial_edges(depot, nodes)
-    savings_list = savings_algorithm.compute_savings_list(nodes)
-    solution = savings_algorithm.create_dummy_solution(nodes)
 
-    # Algorithm iteration process of merging routes
-    while len(savings_list) > 0:
-        n = len(savings_list) - 1
-        position = get_random_position(n, rand_function)
-        candidate = savings_list[position]
-        savings_algorithm.merge_routes(candidate, solution, depot, veh_capacity)
-        savings_list.remove(savings_list[position])
-    return solution
+# state shared by the replicas executed in a worker process, set once when the worker starts
+_worker_state = dict()
+
+
+def _init_worker(instance: PreparedInstance, rand_function: PositionSampler | FunctionType, purge: bool,
+                 engine: str, window: int) -> None:
+    """
+    Stores in the worker process the data shared by all the replicas it will execute
+
+    Parameters
+    ----------
+    instance : PreparedInstance
+        the instance already prepared
+    rand_function : PositionSampler or function
+        the sampler of positions or the function that models how the distribution probability is constructed
+    purge : bool
+        if True the candidates that can not be merged anymore are deleted from the savings list
+    engine : str
+        representation of the solutions during the construction, 'graph' or 'array'
+    window : int
+        max number of live candidates among which the positions are drawn, None for no limit
+    """
+    _worker_state['instance'] = instance
+    _worker_state['rand_function'] = rand_function
+    _worker_state['purge'] = purge
+    _worker_state['engine'] = engine
+    _worker_state['window'] = window
+
+
+def _run_worker_replica(seed: np.random.SeedSequence) -> tuple:
+    """
+    Performs a replica in a worker process and returns it in a compact form
+
+    Parameters
+    ----------
+    seed : SeedSequence
+        seed of the random stream of the replica
+
+    Returns
+    -------
+    cost : float
+        cost of the solution of the replica
+    routes : list
+        for every route, the list of the identifiers of the visited nodes
+    """
+    solution = _construct(_worker_state['instance'], _worker_state['rand_function'], _worker_state['purge'],
+                          seed, _worker_state['engine'], _worker_state['window'])
+    return solution.cost, solution.node_routes()
+
+
+def replica_seed(seed: np.random.SeedSequence, replica: int) -> np.random.SeedSequence:
+    """
+    Returns the seed of a replica derived from the seed of a search. The seed of the search is not modified,
+    so the same seed always leads to the same replicas
+
+    Parameters
+    ----------
+    seed : SeedSequence
+        seed of the whole search
+    replica : int
+        index of the replica
+
+    Returns
+    -------
+    seed : SeedSequence
+        the same child as the replica-th one spawned by a fresh copy of the seed of the search
+    """
+    return np.random.SeedSequence(seed.entropy, spawn_key=seed.spawn_key + (replica,), pool_size=seed.pool_size)
+
+
+def replica_seeds(seed: int | np.random.SeedSequence, iterations: int, offset: int = 0) -> list:
+    """
+    Returns an independent seed for every replica, all derived from a single seed.
+    The replica k of a search can be replayed passing the k-th seed to rand_biased_savings.
+
+    Parameters
+    ----------
+    seed : int or SeedSequence
+        seed of the whole search, if None fresh entropy is used
+    iterations : int
+        number of replicas
+    offset : int
+        index of the first replica, a search of the same seed with this offset continues the previous one
+
+    Returns
+    -------
+    seeds : list
+        one SeedSequence per replica
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return [replica_seed(seed, replica) for replica in range(offset, offset + iterations)]
+
+
+def _best_solution(instance: PreparedInstance, routes: list) -> Solution | None:
+    """
+    Builds the best solution of a set of replicas from its routes
 
+    Parameters
+    ----------
+    instance : PreparedInstance
+        the instance already prepared
+    routes : list or None
+        for every route, the identifiers of the visited nodes in order, None if no replica was performed
 
-def iter_biased_savings(instance_name: str, iterations: int, rand_function: FunctionType) -> Solution:
+    Returns
+    -------
+    best : Solution or None
+        the solution with its edges built, None if no replica was performed
+    """
+    if routes is None:
+        return None
+    best = instance.build_solution(routes)
+    best.materialize()
+    return best
+
+
+def iter_biased_savings(instance: str | PreparedInstance, iterations: int,
+                        rand_function: PositionSampler | FunctionType | np.ndarray,
+                        purge: bool = False, workers: int = 1,
+                        seed: int | np.random.SeedSequence = None, engine: str = 'graph',
+                        window: int = None) -> Solution:
     """
     Performs multiple iterations of a metaheuristic version of savings algorithm.
     As the metaheuristic version is not deterministic is a good practise to perform multiple iterations.
+    The instance is prepared once and every replica only rebuilds the routes.
 
     Parameters
     ----------
-    instance_name : str
-        identifier of the instance
+    instance : str or PreparedInstance
+        identifier of the instance or the instance already prepared
     iterations : int
         number of replicas of the metaheuristic search
-    rand_function :
-        the function that models how the distribution probability is constructed
+    rand_function : PositionSampler, function or np.ndarray
+        the sampler of positions, the function that models how the distribution probability is constructed
+        or the weights of the positions, it must be picklable (not a lambda) when more than one worker is used
+    purge : bool
+        if True the candidates that can not be merged anymore are deleted from the savings list
+    workers : int
+        number of processes that perform the replicas
+    seed : int or SeedSequence
+        seed from which the random stream of every replica is derived (see replica_seeds), the best
+        solution found is the same for any number of workers. If None fresh entropy is used
+    engine : str
+        'graph' to merge Route and Edge objects, 'array' to merge routes stored in an ArraySolution
+    window : int
+        if given, the positions are drawn among the first live candidates up to this number
 
     Returns
     -------
-    best : Solution
-        the solution with the lowest cost in the set of replicas
+    best : Solution or None
+        the solution with the lowest cost in the set of replicas, None if no replica was performed
     """
-    best = None
-    for i in range(iterations):
-        solution = rand_biased_savings(instance_name, rand_function)
-        cost = solution.cost
+    if isinstance(instance, str):
+        instance = prepare_instance(instance)
+
+    # serial execution
+    if workers == 1:
+        best_cost, best_routes = None, None
+        for replica_seed in replica_seeds(seed, iterations):
+            solution = _construct(instance, rand_function, purge, replica_seed, engine, window)
+            if best_cost is None or solution.cost < best_cost:
+                best_cost, best_routes = solution.cost, solution.node_routes()
+        return _best_solution(instance, best_routes)
+
+    # parallel execution, the instance is sent once per worker and only the routes come back
+    seeds = replica_seeds(seed, iterations)
+    chunksize = max(1, iterations // (4 * workers))
+    best_cost, best_routes = None, None
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(instance, rand_function, purge, engine, window)) as executor:
+        for cost, routes in executor.map(_run_worker_replica, seeds, chunksize=chunksize):
+            if best_cost is None or cost < best_cost:
+                best_cost, best_routes = cost, routes
+    return _best_solution(instance, best_routes)
+
+
+# improvement of the best solution found by a streamed search
+Incumbent = namedtuple('Incumbent', ['cost', 'replica', 'elapsed', 'routes'])
+
+
+def _replica_stream(instance: PreparedInstance, rand_function: PositionSampler | FunctionType | np.ndarray,
+                    purge: bool, workers: int, root: np.random.SeedSequence, engine: str, window: int,
+                    max_iterations: int, deadline: float):
+    """
+    Performs replicas until the deadline or the max number of iterations is reached and yields the result of
+    every replica in order of replica, the routes are only exported when the replica improves the best solution
+    found, so the improvements are the same for any number of workers. At least one replica is performed.
+    The clock is read once per replica.
+
+    Parameters
+    ----------
+    instance : PreparedInstance
+        the instance already prepared
+    rand_function : PositionSampler, function or np.ndarray
+        the sampler of positions, the distribution probability function or the weights of the positions
+    purge : bool
+        if True the candidates that can not be merged anymore are deleted from the savings list
+    workers : int
+        number of processes that perform the replicas
+    root : SeedSequence
+        seed of the search, the replica k uses the same seed as in replica_seeds
+    engine : str
+        'graph' to merge Route and Edge objects, 'array' to merge routes stored in an ArraySolution
+    window : int
+        if given, the positions are drawn among the first live candidates up to this number
+    max_iterations : int
+        max number of replicas, None for no limit
+    deadline : float
+        value of time.perf_counter after which no replica is started, None for no limit
+
+    Yields
+    ------
+    replica : int
+        index of the replica, the index of its seed
+    cost : float
+        cost of the solution of the replica
+    routes : list or None
+        for every route the identifiers of the visited nodes, None if the replica is not an improvement
+    """
+    def running(started):
+        if max_iterations is not None and started >= max_iterations:
+            return False
+        return started == 0 or deadline is None or time.perf_counter() < deadline
+
+    # serial execution
+    best_cost = None
+    if workers == 1:
+        replica = 0
+        while running(replica):
+            solution = _construct(instance, rand_function, purge, replica_seed(root, replica), engine, window)
+            if best_cost is None or solution.cost < best_cost:
+                best_cost = solution.cost
+                yield replica, solution.cost, solution.node_routes()
+            else:
+                yield replica, solution.cost, None
+            replica += 1
+        return
+
+    # parallel execution, a few replicas per worker are queued so the workers do not wait for new ones.
+    # The replicas finished out of order are held back, so they are yielded in the same order as in serial
+    submitted, released = 0, 0
+    pending, finished = dict(), dict()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(instance, rand_function, purge, engine, window)) as executor:
         try:
-            if cost < best.cost:
-                best = solution
-        except:
-            best = solution
-    return best
+            while True:
+                while len(pending) < 2 * workers and running(submitted):
+                    pending[executor.submit(_run_worker_replica, replica_seed(root, submitted))] = submitted
+                    submitted += 1
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finished[pending.pop(future)] = future.result()
+                while released in finished:
+                    cost, routes = finished.pop(released)
+                    if best_cost is None or cost < best_cost:
+                        best_cost = cost
+                        yield released, cost, routes
+                    else:
+                        yield released, cost, None
+                    released += 1
+        finally:
+            # the queued replicas are dropped if the caller stops the iteration
+            for future in pending:
+                future.cancel()
+
+
+def anytime_biased_savings(instance: str | PreparedInstance, time_limit: float,
+                           rand_function: PositionSampler | FunctionType | np.ndarray,
+                           purge: bool = False, workers: int = 1, seed: int | np.random.SeedSequence = None,
+                           engine: str = 'graph', window: int = None, max_iterations: int = None) -> tuple:
+    """
+    Performs replicas of a metaheuristic version of savings algorithm until a time limit expires.
+    The clock is read once per replica, so the limit is exceeded at most by the time of the replicas in progress.
+    At least one replica is performed, the time to prepare the instance counts towards the limit.
+
+    Parameters
+    ----------
+    instance : str or PreparedInstance
+        identifier of the instance or the instance already prepared
+    time_limit : float
+        seconds available for the search
+    rand_function : PositionSampler, function or np.ndarray
+        the sampler of positions, the function that models how the distribution probability is constructed
+        or the weights of the positions, it must be picklable (not a lambda) when more than one worker is used
+    purge : bool
+        if True the candidates that can not be merged anymore are deleted from the savings list
+    workers : int
+        number of processes that perform the replicas
+    seed : int or SeedSequence
+        seed from which the random stream of every replica is derived, the replica k uses the same seed
+        as in iter_biased_savings. If None fresh entropy is used
+    engine : str
+        'graph' to merge Route and Edge objects, 'array' to merge routes stored in an ArraySolution
+    window : int
+        if given, the positions are drawn among the first live candidates up to this number
+    max_iterations : int
+        if given, the search also stops after this number of replicas
+
+    Returns
+    -------
+    best : Solution or None
+        the solution with the lowest cost in the set of replicas, None if no replica was performed
+    replicas : int
+        number of replicas performed
+    """
+    deadline = time.perf_counter() + time_limit
+    if isinstance(instance, str):
+        instance = prepare_instance(instance)
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+
+    best_routes, replicas = None, 0
+    for _, _, routes in _replica_stream(instance, rand_function, purge, workers, root, engine, window,
+                                        max_iterations, deadline):
+        replicas += 1
+        if routes is not None:
+            best_routes = routes
+    return _best_solution(instance, best_routes), replicas
+
+
+def stream_biased_savings(instance: str | PreparedInstance,
+                          rand_function: PositionSampler | FunctionType | np.ndarray,
+                          iterations: int = None, time_limit: float = None, purge: bool = False,
+                          workers: int = 1, seed: int | np.random.SeedSequence = None,
+                          engine: str = 'graph', window: int = None):
+    """
+    Performs replicas of a metaheuristic version of savings algorithm and yields every new best solution
+    as soon as it is found. Without iterations nor time limit the replicas go on until the caller stops
+    the iteration. The best solution can be built with PreparedInstance.build_solution(incumbent.routes).
+
+    Parameters
+    ----------
+    instance : str or PreparedInstance
+        identifier of the instance or the instance already prepared
+    rand_function : PositionSampler, function or np.ndarray
+        the sampler of positions, the function that models how the distribution probability is constructed
+        or the weights of the positions, it must be picklable (not a lambda) when more than one worker is used
+    iterations : int
+        if given, max number of replicas
+    time_limit : float
+        if given, seconds after which no replica is started, the time to prepare the instance included
+    purge : bool
+        if True the candidates that can not be merged anymore are deleted from the savings list
+    workers : int
+        number of processes that perform the replicas
+    seed : int or SeedSequence
+        seed from which the random stream of every replica is derived, the replica k uses the same seed
+        as in iter_biased_savings. If None fresh entropy is used
+    engine : str
+        'graph' to merge Route and Edge objects, 'array' to merge routes stored in an ArraySolution
+    window : int
+        if given, the positions are drawn among the first live candidates up to this number
+
+    Yields
+    ------
+    incumbent : Incumbent
+        cost of the new best solution, index of the replica that found it, seconds elapsed since the start
+        and for every route the identifiers of the visited nodes
+    """
+    start = time.perf_counter()
+    deadline = None if time_limit is None else start + time_limit
+    if isinstance(instance, str):
+        instance = prepare_instance(instance)
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+
+    for replica, cost, routes in _replica_stream(instance, rand_function, purge, workers, root, engine, window,
+                                                 iterations, deadline):
+        if routes is not None:
+            yield Incumbent(cost, replica, time.perf_counter() - start, routes)
+
+
+def replica_costs(instance: str | PreparedInstance, iterations: int,
+                  rand_function: PositionSampler | FunctionType | np.ndarray, purge: bool = False,
+                  seed: int | np.random.SeedSequence = None, engine: str = 'graph', window: int = None,
+                  offset: int = 0) -> tuple:
+    """
+    Performs the replicas of a metaheuristic search in this process and returns the cost of every replica
+    together with the best solution, the replicas are the same as in iter_biased_savings with the same seed
+
+    Parameters
+    ----------
+    instance : str or PreparedInstance
+        identifier of the instance or the instance already prepared
+    iterations : int
+        number of replicas of the metaheuristic search
+    rand_function : PositionSampler, function or np.ndarray
+        the sampler of positions, the distribution probability function or the weights of the positions
+    purge : bool
+        if True the candidates that can not be merged anymore are deleted from the savings list
+    seed : int or SeedSequence
+        seed from which the random stream of every replica is derived, if None fresh entropy is used
+    engine : str
+        'graph' to merge Route and Edge objects, 'array' to merge routes stored in an ArraySolution
+    window : int
+        if given, the positions are drawn among the first live candidates up to this number
+    offset : int
+        index of the first replica, a call with the same seed and this offset continues the previous replicas
+
+    Returns
+    -------
+    costs : np.ndarray
+        cost of the solution of every replica
+    best : Solution or None
+        the solution with the lowest cost in the set of replicas, None if no replica was performed
+    """
+    if isinstance(instance, str):
+        instance = prepare_instance(instance)
+    costs = np.empty(iterations)
+    best_routes = None
+    for k, replica_seed in enumerate(replica_seeds(seed, iterations, offset)):
+        solution = _construct(instance, rand_function, purge, replica_seed, engine, window)
+        costs[k] = solution.cost
+        if best_routes is None or solution.cost < costs[best_replica]:
+            best_replica, best_routes = k, solution.node_routes()
+    return costs, _best_solution(instance, best_routes)
 
 
-def triangular_rand_biased_savings(instance_name: str) -> Solution:
+def triangular_rand_biased_savings(instance_name: str, purge: bool = False,
+                                   rng: np.random.Generator | int = None) -> Solution:
     """
     Performs a random biased savings algorithm with triangular distribution
 
@@ -82,18 +654,23 @@ def triangular_rand_biased_savings(instance_name: str) -> Solution:
     ----------
     instance_name : str
         identifier of the instance
+    purge : bool
+        if True the candidates that can not be merged anymore are deleted from the savings list
+    rng : Generator, int or SeedSequence
+        generator of the random numbers or seed to create it
 
     Returns
     -------
     solution : Solution
         the solution achieved by the random biased savings algorithm
     """
-    rand_function = lambda n: (n + 1) * (1 - np.sqrt(np.random.random()))
-    solution = rand_biased_savings(instance_name, rand_function)
+    rand_function = TriangularSampler()
+    solution = rand_biased_savings(instance_name, rand_function, purge, rng)
     return solution
 
 
-def geometrical_rand_biased_savings(instance_name: str, beta: float) -> Solution:
+def geometrical_rand_biased_savings(instance_name: str, beta: float, purge: bool = False,
+                                    rng: np.random.Generator | int = None, window: int = None) -> Solution:
     """
     Performs a random biased savings algorithm with geometrical distribution
 
@@ -103,6 +680,13 @@ def geometrical_rand_biased_savings(instance_name: str, beta: float) -> Solution
         identifier of the instance
     beta : float
         parameter that models the uniformity of the distribution
+    purge : bool
+        if True the candidates that can not be merged anymore are deleted from the savings list
+    rng : Generator, int or SeedSequence
+        generator of the random numbers or seed to create it
+    window : int
+        if given, the positions are drawn among the first live candidates up to this number
+        with the geometric distribution truncated to them
 
     Returns
     -------
@@ -110,12 +694,13 @@ def geometrical_rand_biased_savings(instance_name: str, beta: float) -> Solution
         the solution achieved by the random biased savings algorithm
 
     """
-    rand_function = lambda n: (np.log(np.random.random()) / np.log(1 - beta)) % (n + 1)
-    solution = rand_biased_savings(instance_name, rand_function)
+    rand_function = GeometricSampler(beta) if window is None else TruncatedGeometricSampler(beta)
+    solution = rand_biased_savings(instance_name, rand_function, purge, rng, window=window)
     return solution
 
 
-def iter_triangular_rand_biased_savings(instance_name: str, iterations: int) -> Solution:
+def iter_triangular_rand_biased_savings(instance_name: str, iterations: int, purge: bool = False,
+                                        workers: int = 1, seed: int = None) -> Solution:
     """
     Performs multiple iterations of triangular random biased savings algorithm
     and returns the solution with the lowest cost
@@ -126,18 +711,26 @@ def iter_triangular_rand_biased_savings(instance_name: str, iterations: int) ->
         identifier of the instance
     iterations : int
         number of replicas to perform
+    purge : bool
+        if True the candidates that can not be merged anymore are deleted from the savings list
+    workers : int
+        number of processes that perform the replicas
+    seed : int
+        seed from which the random stream of every replica is derived
 
     Returns
     -------
     best : Solution
         the solution with the lowest cost in the set of replicas
     """
-    rand_function = lambda n: (n + 1) * (1 - np.sqrt(np.random.random()))
-    best = iter_biased_savings(instance_name, iterations, rand_function)
+    rand_function = TriangularSampler()
+    best = iter_biased_savings(instance_name, iterations, rand_function, purge, workers, seed)
     return best
 
 
-def iter_geometrical_rand_biased_savings(instance_name: str, beta: float, iterations: int) -> Solution:
+def iter_geometrical_rand_biased_savings(instance_name: str, beta: float, iterations: int,
+                                         purge: bool = False, workers: int = 1, seed: int = None,
+                                         window: int = None) -> Solution:
     """
     Performs multiple iterations of geometrical random biased savings algorithm
     and returns the solution with the lowest cost
@@ -150,12 +743,21 @@ def iter_geometrical_rand_biased_savings(instance_name: str, beta: float, iterat
         number of iterations to perform
     beta : float
         parameter that models the uniformity of the distribution
+    purge : bool
+        if True the candidates that can not be merged anymore are deleted from the savings list
+    workers : int
+        number of processes that perform the replicas
+    seed : int
+        seed from which the random stream of every replica is derived
+    window : int
+        if given, the positions are drawn among the first live candidates up to this number
+        with the geometric distribution truncated to them
 
     Returns
     -------
     best : Solution
         the solution with the lowest cost in the set of replicas
     """
-    rand_function = lambda n: (np.log(np.random.random()) / np.log(1 - beta)) % (n + 1)
-    best = iter_biased_savings(instance_name, iterations, rand_function)
+    rand_function = GeometricSampler(beta) if window is None else TruncatedGeometricSampler(beta)
+    best = iter_biased_savings(instance_name, iterations, rand_function, purge, workers, seed, window=window)
     return best
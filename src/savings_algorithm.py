@@ -2,15 +2,19 @@
 This module contains the necessary functions to implement the Clarke and Wright savings algorithm
 """
 
-import csv
-import operator
-from itertools import combinations
+import numpy as np
+from scipy.spatial import cKDTree
 from _graph import Node, Edge, Route, Solution
+from _array_solution import ArraySolution
+from _route_loads import RouteLoads
+from _instance_cache import cache_path, load_arrays, save_arrays, load_node_array
+from _data import capacities
 
 
 def _map_veh_capacity(instance_name: str) -> int:
     """
-    Returns the vehicle capacity of a given instance
+    Returns the vehicle capacity of a given instance, the capacity file is only read once per process
+    and again when it is modified
 
     Parameters
     ----------
@@ -21,14 +25,11 @@ def _map_veh_capacity(instance_name: str) -> int:
     veh_capacity : int
         max amount of goods a vehicle can carry
     """
-    with open('../data/veh_capacity.txt') as file:
-        reader = csv.reader(file)
-        capacities_dict = {row[0] : int(row[1]) for row in reader}
-    veh_capacity = capacities_dict[instance_name]
+    veh_capacity = capacities()[instance_name]
     return veh_capacity
 
 
-def read_nodes(instance_name: str) -> tuple:
+def read_nodes(instance_name: str, cache: bool = True) -> tuple:
     """
     Obtains the data needed to perform the savings algorithm over an instance
 
@@ -36,31 +37,42 @@ def read_nodes(instance_name: str) -> tuple:
     ----------
     instance_name : str
         identifier of the instance to read
+    cache : bool
+        if True the node file is converted to a binary file in the cache directory the first time
 
     Returns
     -------
     depot : Node
         the node from where the routes start
-    nodes : Node
-        the nodes to be supplied
+    nodes : list
+        the nodes to be supplied, created from the node file which is parsed in bulk
     veh_capacity : int
         max amount of goods a vehicle can carry
     """
     veh_capacity = _map_veh_capacity(instance_name)
-    file_name = '../data/{}_input_nodes.txt'.format(instance_name)
-    with open(file_name) as instance:
-        i = 0
-        nodes = list()
-        for line in instance:
-            data = [float(x) for x in line.split()]
-            i_node = Node(i, data[0], data[1], data[2])
-            nodes.append(i_node)
-            i += 1
-    depot, nodes = nodes[0], nodes[1:]
+    depot, nodes = _create_nodes(load_node_array(instance_name, cache))
     return depot, nodes, veh_capacity
 
 
-def build_initial_edges(depot: Node, nodes: list) -> None:
+def _create_nodes(data: np.ndarray) -> tuple:
+    """
+    Creates the depot and the nodes to be supplied from the (n + 1, 3) array with the coordinates
+    and the demand of every node, the depot in the first row
+    """
+    rows = data.tolist()
+    depot = Node(0, *rows[0])
+    nodes = [Node(node_id, x, y, demand) for node_id, (x, y, demand) in enumerate(rows[1:], start=1)]
+    return depot, nodes
+
+
+def _node_data(depot: Node, nodes: list) -> np.ndarray:
+    """
+    Returns the (n + 1, 3) array with the coordinates and the demand of the nodes
+    """
+    return np.array([[node.x, node.y, node.demand] for node in [depot] + list(nodes)], dtype=float)
+
+
+def build_initial_edges(depot: Node, nodes: list, distances: np.ndarray = None) -> None:
     """
     Builds the edges of the dummy solution. This edges connect each node with the depot.
     This creates simple routes depot-node-depot for each node.
@@ -71,13 +83,222 @@ def build_initial_edges(depot: Node, nodes: list) -> None:
         the node from where the routes start
     nodes : Node
         the nodes to be supplied
+    distances : np.ndarray
+        distance matrix of the instance indexed by node identifier, if None the costs are computed
     """
     for node in nodes:
-        dn_edge = Edge(depot, node)
+        dn_edge = Edge(depot, node, distances)
         nd_edge = dn_edge.reverse()
         node.dnEdge, node.ndEdge = dn_edge, nd_edge
 
 
+def compute_distance_matrix(depot: Node, nodes: list) -> np.ndarray:
+    """
+    Computes the Euclidean distance between every pair of nodes of the instance
+
+    Parameters
+    ----------
+    depot : Node
+        the node from where the routes start
+    nodes : list
+        the nodes to be supplied
+
+    Returns
+    -------
+    distances : np.ndarray
+        square matrix of distances indexed by node identifier
+    """
+    data = _node_data(depot, nodes)
+    x, y = data[:, 0], data[:, 1]
+    dx = x[:, np.newaxis] - x[np.newaxis, :]
+    dy = y[:, np.newaxis] - y[np.newaxis, :]
+    distances = np.sqrt(dx * dx + dy * dy)
+    return distances
+
+
+def compute_savings_arrays(distances: np.ndarray) -> tuple:
+    """
+    Computes the savings of every pair of nodes and sorts them without building any edge.
+    Ties keep the order in which the pairs are enumerated, as in the savings list.
+
+    Parameters
+    ----------
+    distances : np.ndarray
+        square matrix of distances indexed by node identifier, the depot being the node 0
+
+    Returns
+    -------
+    pairs : np.ndarray
+        (m, 2) array with the identifiers of the nodes of each candidate, sorted by savings
+    savings : np.ndarray
+        savings of each candidate in descending order
+    """
+    n = distances.shape[0]
+    i_ids, j_ids = np.triu_indices(n - 1, k=1)
+    i_ids += 1
+    j_ids += 1
+    savings = distances[0, i_ids] + distances[0, j_ids] - distances[i_ids, j_ids]
+    order = np.argsort(-savings, kind='stable')
+    pairs = np.column_stack((i_ids[order], j_ids[order]))
+    return pairs, savings[order]
+
+
+def _nearest_neighbours(x: np.ndarray, y: np.ndarray, k: int) -> tuple:
+    """
+    Returns the k nearest neighbours of every point using a k-d tree as spatial index, so the time and
+    the memory do not depend on how the points are spread
+
+    Parameters
+    ----------
+    x : np.ndarray
+        x-coordinates of the points
+    y : np.ndarray
+        y-coordinates of the points
+    k : int
+        number of neighbours of each point, lower than the number of points
+
+    Returns
+    -------
+    origins : np.ndarray
+        index of the point of each neighbourhood relation
+    neighbours : np.ndarray
+        index of the neighbour of each neighbourhood relation
+    """
+    n = len(x)
+    if k < 1:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    points = np.column_stack((x, y))
+    _, nearest = cKDTree(points).query(points, k=k + 1)
+
+    # every point is its own nearest one, unless other points share its coordinates and come first
+    own = nearest == np.arange(n)[:, np.newaxis]
+    own[~own.any(axis=1), -1] = True
+    return np.repeat(np.arange(n), k), nearest[~own].astype(np.int64)
+
+
+def compute_granular_savings_arrays(depot: Node, nodes: list, neighbours: int) -> tuple:
+    """
+    Computes the savings of the pairs of nodes where one of them is among the nearest neighbours of the other,
+    without computing the whole distance matrix. Distant pairs hardly ever produce meaningful savings,
+    so the memory and the sorting time are proportional to the number of nodes times the neighbours.
+
+    Parameters
+    ----------
+    depot : Node
+        the node from where the routes start
+    nodes : list
+        the nodes to be supplied
+    neighbours : int
+        number of nearest neighbours of each node that are candidates
+
+    Returns
+    -------
+    pairs : np.ndarray
+        (m, 2) array with the identifiers of the nodes of each candidate, sorted by savings
+    savings : np.ndarray
+        savings of each candidate in descending order
+    """
+    data = _node_data(depot, nodes)
+    x, y = data[1:, 0], data[1:, 1]
+    n = len(nodes)
+    k = min(neighbours, n - 1)
+    origins, ends = _nearest_neighbours(x, y, k)
+
+    # unique pairs enumerated in the same order as the complete savings list
+    keys = np.unique(np.minimum(origins, ends) * n + np.maximum(origins, ends))
+    i_pos, j_pos = np.divmod(keys, n)
+    dx, dy = x - depot.x, y - depot.y
+    depot_distances = np.sqrt(dx * dx + dy * dy)
+    dx, dy = x[i_pos] - x[j_pos], y[i_pos] - y[j_pos]
+    savings = depot_distances[i_pos] + depot_distances[j_pos] - np.sqrt(dx * dx + dy * dy)
+
+    order = np.argsort(-savings, kind='stable')
+    pairs = np.column_stack((i_pos[order] + 1, j_pos[order] + 1))
+    return pairs, savings[order]
+
+
+def load_instance(instance_name: str, neighbours: int = None, cache: bool = True) -> tuple:
+    """
+    Obtains the data of an instance together with its distances and sorted savings, from the on-disk cache
+    if they were already computed for the same contents of the data files
+
+    Parameters
+    ----------
+    instance_name : str
+        identifier of the instance
+    neighbours : int
+        if given, only the pairs where a node is among the nearest neighbours of the other are candidates
+        and the distance matrix is not computed
+    cache : bool
+        if True the preprocessed arrays are read from the cache, or written to it the first time when the
+        cache directory can be written. If False nothing is read from or written to the cache directory
+
+    Returns
+    -------
+    depot : Node
+        the node from where the routes start
+    nodes : list
+        the nodes to be supplied
+    veh_capacity : int
+        max amount of goods a vehicle can carry
+    distances : np.ndarray
+        square matrix of distances indexed by node identifier, None for granular candidates
+    pairs : np.ndarray
+        (m, 2) array with the identifiers of the nodes of each candidate, sorted by savings
+    savings : np.ndarray
+        savings of each candidate in descending order
+    """
+    path = cache_path(instance_name, neighbours) if cache else None
+    arrays = load_arrays(path) if cache else None
+    if arrays is not None:
+        depot, nodes = _create_nodes(arrays['nodes'])
+        veh_capacity = int(arrays['veh_capacity'])
+        return depot, nodes, veh_capacity, arrays.get('distances'), arrays['pairs'], arrays['savings']
+
+    depot, nodes, veh_capacity = read_nodes(instance_name, cache)
+    if neighbours is None:
+        distances = compute_distance_matrix(depot, nodes)
+        pairs, savings = compute_savings_arrays(distances)
+    else:
+        distances = None
+        pairs, savings = compute_granular_savings_arrays(depot, nodes, neighbours)
+    if cache:
+        arrays = {'nodes': _node_data(depot, nodes), 'veh_capacity': np.array(veh_capacity),
+                  'pairs': pairs, 'savings': savings}
+        if distances is not None:
+            arrays['distances'] = distances
+        save_arrays(path, **arrays)
+    return depot, nodes, veh_capacity, distances, pairs, savings
+
+
+def build_candidate_edge(i_node: Node, j_node: Node, savings: float, distances: np.ndarray = None) -> Edge:
+    """
+    Materializes the edge of a savings candidate and its inverse
+
+    Parameters
+    ----------
+    i_node : Node
+        origin node of the candidate
+    j_node : Node
+        end node of the candidate
+    savings : float
+        distance saved when merging the routes by this candidate
+    distances : np.ndarray
+        distance matrix of the instance indexed by node identifier, if None the cost is computed
+
+    Returns
+    -------
+    ij_edge : Edge
+        the candidate edge
+    """
+    ij_edge = Edge(i_node, j_node, distances)
+    ji_edge = ij_edge.reverse()
+
+    ij_edge.savings = savings
+    ji_edge.savings = savings
+    return ij_edge
+
+
 def compute_savings_list(nodes: list) -> list:
     """
     Computes the savings list of Clarke and Wright savings algorithm
@@ -92,19 +313,11 @@ def compute_savings_list(nodes: list) -> list:
     savings_list : list
         ordered list with best candidates to save distance when merging routes
     """
-    savings_list = list()
-    candidates_list = combinations(nodes, 2)
-    for iNode, jNode in candidates_list:
-        ij_edge = Edge(iNode, jNode)
-        ji_edge = ij_edge.reverse()
-
-        ij_edge.invEdge = ji_edge
-        ji_edge.invEdge = ij_edge
-        ij_edge.savings = iNode.ndEdge.cost + jNode.dnEdge.cost - ij_edge.cost
-        ji_edge.savings = ij_edge.savings
-
-        savings_list.append(ij_edge)
-    savings_list.sort(key=operator.attrgetter('savings'), reverse=True)
+    depot = nodes[0].dnEdge.origin
+    distances = compute_distance_matrix(depot, nodes)
+    pairs, savings = compute_savings_arrays(distances)
+    savings_list = [build_candidate_edge(nodes[i - 1], nodes[j - 1], saving, distances)
+                    for (i, j), saving in zip(pairs.tolist(), savings.tolist())]
     return savings_list
 
 
@@ -136,6 +349,7 @@ def create_dummy_solution(nodes: list) -> Solution:
         # Changes node parameters
         node.inRoute = dnd_route
         node.isInterior = False
+        node.unlink()
 
         # Adds the route in the solution
         solution += dnd_route
@@ -164,9 +378,10 @@ def _is_joinable(i_node: Node, j_node: Node, veh_capacity: int) -> bool:
     bool
         specifies if it is possible to join both routes
     """
-    condition1 = i_node.inRoute == j_node.inRoute
+    i_route, j_route = i_node.inRoute, j_node.inRoute
+    condition1 = i_route is j_route
     condition2 = i_node.isInterior or j_node.isInterior
-    condition3 = i_node.inRoute.demand + j_node.inRoute.demand > veh_capacity
+    condition3 = i_route.demand + j_route.demand > veh_capacity
 
     if condition1 or condition2 or condition3:
         return False
@@ -194,15 +409,13 @@ def _get_depot_edge(i_node: Node, depot: Node) -> Edge:
     first_edge OR last_edge : Edge
         the edge that connects the node to the depot node
     """
+    route = i_node.inRoute
 
-    first_edge = i_node.inRoute.edges[0]
-    last_edge = i_node.inRoute.edges[-1]
-
-    if first_edge.origin == depot and first_edge.end == i_node:  # first edge
-        return first_edge
+    if route.first is i_node:  # first edge
+        return i_node.dnEdge
 
-    elif last_edge.origin == i_node and last_edge.end == depot:  # last edge
-        return last_edge
+    elif route.last is i_node:  # last edge
+        return i_node.ndEdge
 
 
 def merge_routes(candidate: Edge, solution: Solution, depot: Node, veh_capacity: int) -> None:
@@ -227,39 +440,30 @@ def merge_routes(candidate: Edge, solution: Solution, depot: Node, veh_capacity:
 
     # if possible makes the merge
     if merge_test is True:
-        i_edge = _get_depot_edge(i_node, depot)
-        j_edge = _get_depot_edge(j_node, depot)
-
         i_route = i_node.inRoute
         j_route = j_node.inRoute
         solution -= j_route
         solution -= i_route
 
-        i_route -= i_edge
-        if i_edge.origin == depot:
+        # orients the routes so that i_route ends in i_node and j_route starts in j_node
+        if i_route.last is not i_node:
             i_route.reverse()
-
-        if len(i_route.edges) > 1:
+        if i_route.first is not i_node:
             i_node.isInterior = True
+        i_route -= i_node.ndEdge
 
-        j_route -= j_edge
-        if j_edge.end == depot:
+        if j_route.first is not j_node:
             j_route.reverse()
-
-        if len(j_route.edges) > 1:
+        if j_route.last is not j_node:
             j_node.isInterior = True
+        j_route -= j_node.dnEdge
 
-        i_route += candidate
-        j_node.inRoute = i_route
-
-        for edge in j_route.edges:
-            i_route += edge
-            node = edge.end
-            node.inRoute = i_route
+        i_node.union(j_node, i_route)
+        i_route.splice(candidate, j_route)
         solution += i_route
 
 
-def cw_savings(instance_name: str) -> Solution:
+def cw_savings(instance_name: str, neighbours: int = None, engine: str = 'graph', cache: bool = True) -> Solution:
     """
     Computes the solution with the savings algorithm.
 
@@ -267,22 +471,52 @@ def cw_savings(instance_name: str) -> Solution:
     ----------
     instance_name : str
         identifier of the instance
+    neighbours : int
+        if given, only the pairs where a node is among the nearest neighbours of the other are candidates
+    engine : str
+        'graph' to merge Route and Edge objects, 'array' to merge routes stored in an ArraySolution
+        that is exported to a Solution at the end. Both engines build the same routes
+    cache : bool
+        if True the distances and the sorted savings are read from the on-disk cache when available
+
     Returns
     -------
     solution : Solution
         the solution achieved by the savings algorithm
     """
-    # reads the data of the given instance
-    depot, nodes, veh_capacity = read_nodes(instance_name)
-    build_initial_edges(depot, nodes)
-    # savings list construction
-    savings_list = compute_savings_list(nodes)
+    # reads the data of the given instance and the savings candidates,
+    # the edges are only built when a merge is accepted
+    depot, nodes, veh_capacity, distances, pairs, savings = load_instance(instance_name, neighbours, cache)
+    build_initial_edges(depot, nodes, distances)
+
+    if engine == 'array':
+        solution = ArraySolution.from_nodes(depot, nodes, veh_capacity, distances)
+        loads = RouteLoads(solution.load[1:], veh_capacity)
+        for (i, j), saving in zip(pairs.tolist(), savings.tolist()):
+            if not loads.mergeable:
+                break
+            if solution.is_joinable(i, j):
+                i_load, j_load = solution.load[solution.route_id[i]], solution.load[solution.route_id[j]]
+                solution.merge(i, j, saving)
+                loads.merge(i_load, j_load, solution.load[solution.route_id[i]])
+        return solution.to_solution(nodes, distances)
+    elif engine != 'graph':
+        raise ValueError("engine must be 'graph' or 'array', not {!r}".format(engine))
 
     # creates the dummy solution where every node has its own route depot-node-depot
     solution = create_dummy_solution(nodes)
-
-    # iterates over the savings list and merge every candidate that satisfies the conditions
-    for candidate in savings_list:
-        merge_routes(candidate, solution, depot, veh_capacity)
+    loads = RouteLoads([route.demand for route in solution.routes], veh_capacity)
+
+    # iterates over the savings candidates and merge every candidate that satisfies the conditions,
+    # until no pair of routes fits in a vehicle
+    for (i, j), saving in zip(pairs.tolist(), savings.tolist()):
+        if not loads.mergeable:
+            break
+        i_node, j_node = nodes[i - 1], nodes[j - 1]
+        if _is_joinable(i_node, j_node, veh_capacity):
+            i_load, j_load = i_node.inRoute.demand, j_node.inRoute.demand
+            candidate = build_candidate_edge(i_node, j_node, saving, distances)
+            merge_routes(candidate, solution, depot, veh_capacity)
+            loads.merge(i_load, j_load, i_node.inRoute.demand)
 
     return solution